@@ -1,5 +1,12 @@
 import pygame
 import math
+import json
+import os
+import random
+import sys
+import hashlib
+from collections import deque, OrderedDict
+import numpy as np
 
 # --- Configuration ---
 # Colors
@@ -26,28 +33,44 @@ GRID_SIZE = 20  # Number of cells in width/height (e.g., 20x20 grid)
 CELL_SIZE = 40  # Pixels per cell
 SCREEN_WIDTH = GRID_SIZE * CELL_SIZE
 SCREEN_HEIGHT = GRID_SIZE * CELL_SIZE + 100 # Add space for UI panel
+VIEW_HEIGHT = SCREEN_HEIGHT - 100 # Dungeon viewport above the UI panel
+CHUNK_CELLS = 16 # Map tiles are pre-rendered in square chunks of this many cells
+MAX_CACHED_CHUNKS = 64 # Maps up to this many chunks are fully pre-rendered at load; larger ones render lazily (LRU)
+MAX_CACHED_ROUTES = 8 # Route data kept for the most recently loaded dungeons (LRU)
+SCROLL_SPEED = 12 # Camera pixels per frame while an arrow key is held
+
+# Simulation timing. All speeds are in pixels per second and all cooldowns and delays in seconds.
+SIM_DT = 1 / 60 # Fixed simulation step
+MAX_FRAME_TIME = 0.25 # A longer frame (window drag, breakpoint) is clamped so the simulation cannot spiral
+FAST_FORWARD_SPEEDS = (1, 2, 4) # Cycled with the F key
+PROJECTILE_SPEED = 600 # Pixels per second
+PROJECTILE_SIZE = 5
+ENEMY_GRID_CELL = 2 * CELL_SIZE # Bucket size of the enemy index used for trap targeting
 
 # Trap/Enemy properties (example, will be expanded)
 TRAP_TYPES = {
-    "spike": {"cost": 50, "damage": 10, "range": 0, "cooldown": 60, "color": COLORS["trap_spike"]},
-    "arrow": {"cost": 75, "damage": 15, "range": 3 * CELL_SIZE, "cooldown": 45, "color": COLORS["trap_spike"]}, # Placeholder, imagine a turret
-    "magic": {"cost": 100, "damage": 20, "range": 2 * CELL_SIZE, "cooldown": 90, "color": COLORS["trap_magic"]}
+    "spike": {"cost": 50, "damage": 10, "range": 0, "cooldown": 1.0, "color": COLORS["trap_spike"]},
+    "arrow": {"cost": 75, "damage": 15, "range": 3 * CELL_SIZE, "cooldown": 0.75, "color": COLORS["trap_spike"]}, # Placeholder, imagine a turret
+    "magic": {"cost": 100, "damage": 20, "range": 2 * CELL_SIZE, "cooldown": 1.5, "color": COLORS["trap_magic"]}
 }
 ENEMY_TYPES = {
-    "goblin": {"health": 50, "speed": 1, "reward": 10, "color": COLORS["enemy_goblin"], "size": CELL_SIZE // 3},
-    "orc": {"health": 150, "speed": 0.7, "reward": 25, "color": COLORS["enemy_orc"], "size": CELL_SIZE // 2}
+    "goblin": {"health": 50, "speed": 60, "reward": 10, "color": COLORS["enemy_goblin"], "size": CELL_SIZE // 3},
+    "orc": {"health": 150, "speed": 42, "reward": 25, "color": COLORS["enemy_orc"], "size": CELL_SIZE // 2}
 }
 
 # Game State
-GAME_STATE = {
-    "placing_trap": None, # Stores the type of trap being placed
-    "wave_active": False,
-    "money": 5200,
-    "score": 0,
-    "wave_number": 0,
-    "lives": 10,
-    "start_wave_requested": False # NEW: Flag to request wave start
-}
+class GameState:
+    """Per-game player and wave state, so several games can run side by side in one process."""
+    __slots__ = ("placing_trap", "wave_active", "money", "score", "wave_number", "lives", "start_wave_requested")
+
+    def __init__(self, money=5200, lives=10):
+        self.placing_trap = None # Stores the type of trap being placed
+        self.wave_active = False
+        self.money = money
+        self.score = 0
+        self.wave_number = 0
+        self.lives = lives
+        self.start_wave_requested = False # Flag to request wave start
 
 # --- Game Utility Functions ---
 def world_to_grid(pos):
@@ -58,14 +81,113 @@ def grid_to_world(grid_pos):
     """Converts grid coordinates to the center of a cell in pixel coordinates."""
     return grid_pos[0] * CELL_SIZE + CELL_SIZE // 2, grid_pos[1] * CELL_SIZE + CELL_SIZE // 2
 
+class Camera:
+    """Scrollable viewport onto the dungeon. (x, y) is the world pixel shown at the top-left of the view."""
+    def __init__(self, view_width, view_height, world_width, world_height):
+        self.view_width, self.view_height = view_width, view_height
+        self.world_width, self.world_height = world_width, world_height
+        self.x, self.y = 0, 0
+
+    def scroll(self, dx, dy):
+        self.x = max(0, min(self.x + dx, self.world_width - self.view_width))
+        self.y = max(0, min(self.y + dy, self.world_height - self.view_height))
+
+    def center_on(self, pos):
+        self.x, self.y = 0, 0
+        self.scroll(pos[0] - self.view_width // 2, pos[1] - self.view_height // 2)
+
+    @property
+    def offset(self):
+        return self.x, self.y
+
+    def screen_to_world(self, pos):
+        return pos[0] + self.x, pos[1] + self.y
+
+    def is_visible(self, x, y, margin=CELL_SIZE):
+        """True if the world point is inside the view, allowing margin pixels for the object's size."""
+        return (self.x - margin <= x <= self.x + self.view_width + margin and
+                self.y - margin <= y <= self.y + self.view_height + margin)
+
+def load_dungeon(filename):
+    """Loads a dungeon grid from a text file (one row per line) or a JSON file ({"grid": [rows]} or [rows]).
+    Uses the same cell codes as the built-in grid: # wall, P path, S start, E end, T trap slot."""
+    with open(filename, 'r') as f:
+        if os.path.splitext(filename)[1].lower() == ".json":
+            data = json.load(f)
+            rows = data["grid"] if isinstance(data, dict) else data
+        else:
+            rows = [line.rstrip("\r\n") for line in f if line.strip()]
+    width = max(len(row) for row in rows)
+    return [list(row.ljust(width, '#')) for row in rows]
+
+# Route data keyed by a hash of the grid contents, so reloading or restarting the same dungeon skips the search
+_ROUTE_CACHE = OrderedDict()
+
+class DungeonRoutes:
+    """Breadth-first distance field over walkable cells ('P', 'S', 'E'), measured from the end cell.
+    Any neighbour one step closer to the end is a valid next step, so forks of equal length are all
+    followed; branches that do not reach the end are never entered."""
+    WALKABLE = frozenset("PSE")
+
+    def __init__(self, grid, start, end):
+        self.width, self.height = len(grid[0]), len(grid)
+        self.start, self.end = start, end
+        w, h = self.width, self.height
+        self.distance = dist = [-1] * (w * h)
+        if start is None or end is None: return
+        dist[end[1] * w + end[0]] = 0
+        frontier = deque([end])
+        while frontier:
+            x, y = frontier.popleft()
+            d = dist[y * w + x] + 1
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if 0 <= nx < w and 0 <= ny < h and dist[ny * w + nx] < 0 and grid[ny][nx] in self.WALKABLE:
+                    dist[ny * w + nx] = d
+                    frontier.append((nx, ny))
+
+    def is_connected(self):
+        return self.start is not None and self.distance[self.start[1] * self.width + self.start[0]] >= 0
+
+    def next_steps(self, cell):
+        x, y = cell
+        w, dist = self.width, self.distance
+        d = dist[y * w + x]
+        return [(nx, ny) for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                if 0 <= nx < w and 0 <= ny < self.height and d > 0 and dist[ny * w + nx] == d - 1]
+
+    def cells(self, rng=None):
+        """Grid cells from start to end. At a fork the first option is taken, or a random one if rng is given."""
+        if not self.is_connected(): return []
+        cell, path = self.start, [self.start]
+        while cell != self.end:
+            options = self.next_steps(cell)
+            cell = rng.choice(options) if rng and len(options) > 1 else options[0]
+            path.append(cell)
+        return path
+
+    @classmethod
+    def for_grid(cls, grid, start, end):
+        key = hashlib.sha1("\n".join("".join(row) for row in grid).encode()).digest()
+        if key in _ROUTE_CACHE:
+            _ROUTE_CACHE.move_to_end(key)
+        else:
+            _ROUTE_CACHE[key] = cls(grid, start, end)
+            if len(_ROUTE_CACHE) > MAX_CACHED_ROUTES: _ROUTE_CACHE.popitem(last=False)
+        return _ROUTE_CACHE[key]
+
 # --- Game Classes ---
 
 class GameObject:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.prev_x, self.prev_y = x, y # Position at the start of the current simulation step
         self.rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
 
+    def render_offset(self, offset, alpha):
+        """Camera offset that draws this object interpolated between its last two simulation positions."""
+        return (offset[0] + (1 - alpha) * (self.x - self.prev_x), offset[1] + (1 - alpha) * (self.y - self.prev_y))
+
     def draw(self, screen):
         raise NotImplementedError
 
@@ -85,59 +207,81 @@ class PathNode(GameObject):
 class Map:
     def __init__(self, grid):
         self.grid = grid # 2D list representing the dungeon layout
-        self.path_nodes = []
         self.trap_slots = []
         self.start_node = None
         self.end_node = None
         self._parse_grid()
 
     def _parse_grid(self):
-        """Parses the grid to identify path nodes, trap slots, start, and end."""
-        for r in range(len(self.grid)):
-            for c in range(len(self.grid[r])):
-                cell_type = self.grid[r][c]
-                world_x, world_y = c * CELL_SIZE, r * CELL_SIZE
-                if cell_type == 'P': # Path
-                    self.path_nodes.append(PathNode(world_x, world_y, "path"))
-                elif cell_type == 'S': # Start
-                    self.start_node = PathNode(world_x, world_y, "start")
-                    self.path_nodes.insert(0, self.start_node) # Ensure start is first
+        """Parses the grid to identify trap slots, start and end, then extracts the enemy route."""
+        for r, row in enumerate(self.grid):
+            for c, cell_type in enumerate(row):
+                if cell_type == 'S': # Start
+                    self.start_node = PathNode(c * CELL_SIZE, r * CELL_SIZE, "start")
                 elif cell_type == 'E': # End
-                    self.end_node = PathNode(world_x, world_y, "end")
-                    self.path_nodes.append(self.end_node) # Ensure end is last
+                    self.end_node = PathNode(c * CELL_SIZE, r * CELL_SIZE, "end")
                 elif cell_type == 'T': # Trap Slot
                     self.trap_slots.append((c, r)) # Store grid coordinates
 
-        # Simple pathfinding (assuming linear path for now)
-        # In a real game, you'd use A* or similar
-        self.enemy_path = []
-        if self.start_node and self.end_node:
-            # For simplicity, assume path nodes are already ordered correctly in self.path_nodes
-            # or implement a basic 'follow the next path node' logic here.
-            # For now, let's just use the parsed order.
-            self.enemy_path = [grid_to_world(world_to_grid((node.x, node.y))) for node in self.path_nodes]
-
-
-    def draw(self, screen):
-        for r in range(len(self.grid)):
-            for c in range(len(self.grid[r])):
-                cell_type = self.grid[r][c]
-                rect = pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-
-                if cell_type == '#': # Wall
-                    pygame.draw.rect(screen, COLORS["wall"], rect)
-                    # Add simple "stone block" texture (rectangles for shading)
-                    pygame.draw.rect(screen, (50, 50, 50), rect, 2) # Border
-                    pygame.draw.line(screen, (30, 30, 30), rect.topleft, rect.bottomright, 1)
-                    pygame.draw.line(screen, (30, 30, 30), rect.topright, rect.bottomleft, 1)
-
-                elif cell_type in ['P', 'S', 'E']: # Path
-                    pygame.draw.rect(screen, COLORS["path"], rect)
-                    # Add subtle path details
-                    pygame.draw.rect(screen, (70, 70, 70), rect, 1)
-                elif cell_type == 'T': # Trap Slot
-                    pygame.draw.rect(screen, COLORS["trap_slot"], rect)
-                    pygame.draw.rect(screen, COLORS["ui_border"], rect, 2) # Border for slots
+        start = world_to_grid((self.start_node.x, self.start_node.y)) if self.start_node else None
+        end = world_to_grid((self.end_node.x, self.end_node.y)) if self.end_node else None
+        self.routes = DungeonRoutes.for_grid(self.grid, start, end)
+        if start and end and not self.routes.is_connected():
+            print("Warning: no path of 'P' cells connects S to E.")
+        self._render_chunks()
+
+    def _render_chunks(self):
+        """Pre-renders every chunk at load time, unless the dungeon is too large to keep in memory."""
+        self.chunks = OrderedDict()
+        self.chunk_cols = -(-len(self.grid[0]) // CHUNK_CELLS)
+        self.chunk_rows = -(-len(self.grid) // CHUNK_CELLS)
+        if self.chunk_cols * self.chunk_rows <= MAX_CACHED_CHUNKS:
+            for cy in range(self.chunk_rows):
+                for cx in range(self.chunk_cols): self.chunk(cx, cy)
+
+    def chunk(self, cx, cy):
+        """The pre-rendered surface for chunk (cx, cy), rendered on first use and kept in an LRU cache."""
+        surface = self.chunks.get((cx, cy))
+        if surface is not None:
+            self.chunks.move_to_end((cx, cy))
+            return surface
+        c0, r0 = cx * CHUNK_CELLS, cy * CHUNK_CELLS
+        rows = self.grid[r0:r0 + CHUNK_CELLS]
+        cols = min(CHUNK_CELLS, len(self.grid[0]) - c0)
+        surface = pygame.Surface((cols * CELL_SIZE, len(rows) * CELL_SIZE))
+        surface.fill(COLORS["background"])
+        for r, row in enumerate(rows):
+            for c, cell_type in enumerate(row[c0:c0 + cols]):
+                self._draw_tile(surface, cell_type, pygame.Rect(c * CELL_SIZE, r * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+        self.chunks[(cx, cy)] = surface
+        if len(self.chunks) > MAX_CACHED_CHUNKS: self.chunks.popitem(last=False)
+        return surface
+
+    def _draw_tile(self, surface, cell_type, rect):
+        if cell_type == '#': # Wall
+            pygame.draw.rect(surface, COLORS["wall"], rect)
+            # Add simple "stone block" texture (rectangles for shading)
+            pygame.draw.rect(surface, (50, 50, 50), rect, 2) # Border
+            pygame.draw.line(surface, (30, 30, 30), rect.topleft, rect.bottomright, 1)
+            pygame.draw.line(surface, (30, 30, 30), rect.topright, rect.bottomleft, 1)
+
+        elif cell_type in ['P', 'S', 'E']: # Path
+            pygame.draw.rect(surface, COLORS["path"], rect)
+            # Add subtle path details
+            pygame.draw.rect(surface, (70, 70, 70), rect, 1)
+        elif cell_type == 'T': # Trap Slot
+            pygame.draw.rect(surface, COLORS["trap_slot"], rect)
+            pygame.draw.rect(surface, COLORS["ui_border"], rect, 2) # Border for slots
+
+    def draw(self, screen, camera):
+        """Blits only the chunks that intersect the camera view."""
+        chunk_px = CHUNK_CELLS * CELL_SIZE
+        first_cx, first_cy = camera.x // chunk_px, camera.y // chunk_px
+        last_cx = min(self.chunk_cols - 1, (camera.x + camera.view_width - 1) // chunk_px)
+        last_cy = min(self.chunk_rows - 1, (camera.y + camera.view_height - 1) // chunk_px)
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                screen.blit(self.chunk(cx, cy), (cx * chunk_px - camera.x, cy * chunk_px - camera.y))
 
 class Trap(GameObject):
     def __init__(self, grid_x, grid_y, trap_type):
@@ -153,8 +297,9 @@ class Trap(GameObject):
         self.color = self.properties["color"]
         self.is_active = False # For animation or effect
 
-    def draw(self, screen):
-        center_x, center_y = self.x + CELL_SIZE // 2, self.y + CELL_SIZE // 2
+    def draw(self, screen, offset=(0, 0)):
+        x, y = self.x - offset[0], self.y - offset[1]
+        center_x, center_y = x + CELL_SIZE // 2, y + CELL_SIZE // 2
 
         if self.type == "spike":
             # Draw spikes
@@ -166,12 +311,12 @@ class Trap(GameObject):
                 (center_x + spike_width, center_y + spike_height)
             ])
             pygame.draw.polygon(screen, self.color, [
-                (self.x + CELL_SIZE // 4, self.y + CELL_SIZE * 3 // 4),
-                (self.x + CELL_SIZE // 2, self.y + CELL_SIZE // 4),
-                (self.x + CELL_SIZE * 3 // 4, self.y + CELL_SIZE * 3 // 4)
+                (x + CELL_SIZE // 4, y + CELL_SIZE * 3 // 4),
+                (x + CELL_SIZE // 2, y + CELL_SIZE // 4),
+                (x + CELL_SIZE * 3 // 4, y + CELL_SIZE * 3 // 4)
             ])
             # Base of the trap
-            pygame.draw.rect(screen, (80, 0, 0), (self.x + CELL_SIZE // 8, self.y + CELL_SIZE * 3 // 4, CELL_SIZE * 3 // 4, CELL_SIZE // 8))
+            pygame.draw.rect(screen, (80, 0, 0), (x + CELL_SIZE // 8, y + CELL_SIZE * 3 // 4, CELL_SIZE * 3 // 4, CELL_SIZE // 8))
 
         elif self.type == "magic":
             # Draw a glowing rune/glyph
@@ -195,39 +340,40 @@ class Trap(GameObject):
         if self.is_active: # Or if currently hovered/selected
              pygame.draw.circle(screen, (255, 255, 255, 50), (center_x, center_y), self.range, 1) # Transparent circle
 
-    def update(self, dt, enemies):
+    def update(self, dt, enemy_grid, projectiles):
+        """Counts down the cooldown and attacks when ready: ranged traps fire a projectile at the nearest enemy
+        in range, melee traps (spikes) hit an enemy standing on them."""
         if self.cooldown_current > 0:
             self.cooldown_current -= dt
             self.is_active = False
+            return
+        self.cooldown_current = 0
+        target = self.find_target(enemy_grid)
+        if target is None:
+            return
+        if self.range > 0:
+            projectiles.fire((self.x + CELL_SIZE // 2, self.y + CELL_SIZE // 2), target, self.damage)
         else:
-            self.cooldown_current = 0
-            # Check for enemies in range and attack
-            if self.range > 0: # Ranged traps
-                for enemy in enemies:
-                    if self.distance_to(enemy) <= self.range:
-                        # Simple attack logic, will be expanded with projectiles
-                        enemy.take_damage(self.damage)
-                        self.cooldown_current = self.cooldown_max
-                        self.is_active = True
-                        break # Only attack one enemy per cooldown
-            else: # Melee/AoE traps (like spikes)
-                for enemy in enemies:
-                    if self.rect.colliderect(enemy.rect): # Enemy is on top of the trap
-                        enemy.take_damage(self.damage)
-                        self.cooldown_current = self.cooldown_max
-                        self.is_active = True
-                        break # Only activate for one enemy passing over (for now)
-
-    def distance_to(self, other):
-        """Calculates distance to another game object."""
-        center_self = self.x + CELL_SIZE // 2, self.y + CELL_SIZE // 2
-        center_other = other.x + other.size // 2, other.y + other.size // 2
-        return math.hypot(center_self[0] - center_other[0], center_self[1] - center_other[1])
+            target.take_damage(self.damage)
+        self.cooldown_current = self.cooldown_max
+        self.is_active = True
+
+    def find_target(self, enemy_grid):
+        if self.range > 0: # Ranged traps
+            return enemy_grid.nearest((self.x + CELL_SIZE // 2, self.y + CELL_SIZE // 2), self.range)
+        for enemy in enemy_grid.query((self.x + CELL_SIZE // 2, self.y + CELL_SIZE // 2), CELL_SIZE):
+            if enemy.alive and self.rect.colliderect(enemy.rect): # Enemy is on top of the trap
+                return enemy
+        return None
 
 
 class Enemy(GameObject):
-    def __init__(self, enemy_type, path, start_node_pos):
+    """Walks the route's distance field one cell at a time, choosing the next step only on reaching a cell,
+    so spawning never builds a path and enemies share the route data."""
+    def __init__(self, enemy_type, routes, rng=random):
         # Start at the actual pixel coordinates of the start node, not just 0,0
+        connected = routes.is_connected()
+        start_node_pos = grid_to_world(routes.start) if connected else (0, 0)
         super().__init__(start_node_pos[0], start_node_pos[1])
         self.type = enemy_type
         self.properties = ENEMY_TYPES[enemy_type]
@@ -238,19 +384,21 @@ class Enemy(GameObject):
         self.color = self.properties["color"]
         self.size = self.properties["size"] # Diameter for circles, side for squares
 
-        self.path = path
-        self.path_index = 0
-        if self.path:
-            self.target_pos = self.path[self.path_index]
+        self.routes = routes
+        self.rng = rng
+        self.cell = routes.start if connected else None # Grid cell being walked towards; None means no route
+        if self.cell:
+            self.target_pos = grid_to_world(self.cell)
         else:
             self.target_pos = (self.x, self.y) # No path, stay put
 
         self.alive = True
         self.reached_end = False
 
-    def draw(self, screen):
-        center_x = self.x + self.size // 2
-        center_y = self.y + self.size // 2
+    def draw(self, screen, offset=(0, 0)):
+        x, y = self.x - offset[0], self.y - offset[1]
+        center_x = x + self.size // 2
+        center_y = y + self.size // 2
 
         if self.type == "goblin":
             pygame.draw.circle(screen, self.color, (center_x, center_y), self.size // 2)
@@ -263,19 +411,19 @@ class Enemy(GameObject):
 
         elif self.type == "orc":
             # Draw a square with some details
-            orc_rect = pygame.Rect(self.x, self.y, self.size, self.size)
+            orc_rect = pygame.Rect(x, y, self.size, self.size)
             pygame.draw.rect(screen, self.color, orc_rect)
             pygame.draw.rect(screen, (self.color[0]//2, self.color[1]//2, self.color[2]//2), orc_rect, 2) # Outline
             # Tusks (simple triangles)
             pygame.draw.polygon(screen, (255, 255, 200), [
-                (self.x + self.size // 4, self.y + self.size * 3 // 4),
-                (self.x + self.size // 4 + self.size // 8, self.y + self.size),
-                (self.x + self.size // 4 - self.size // 8, self.y + self.size)
+                (x + self.size // 4, y + self.size * 3 // 4),
+                (x + self.size // 4 + self.size // 8, y + self.size),
+                (x + self.size // 4 - self.size // 8, y + self.size)
             ])
             pygame.draw.polygon(screen, (255, 255, 200), [
-                (self.x + self.size * 3 // 4, self.y + self.size * 3 // 4),
-                (self.x + self.size * 3 // 4 + self.size // 8, self.y + self.size),
-                (self.x + self.size * 3 // 4 - self.size // 8, self.y + self.size)
+                (x + self.size * 3 // 4, y + self.size * 3 // 4),
+                (x + self.size * 3 // 4 + self.size // 8, y + self.size),
+                (x + self.size * 3 // 4 - self.size // 8, y + self.size)
             ])
 
 
@@ -283,22 +431,18 @@ class Enemy(GameObject):
         health_bar_width = self.size
         health_bar_height = 5
         health_percent = self.health / self.max_health
-        health_bar_x = self.x
-        health_bar_y = self.y - health_bar_height - 2 # Above the enemy
+        health_bar_x = x
+        health_bar_y = y - health_bar_height - 2 # Above the enemy
 
         pygame.draw.rect(screen, COLORS["health_bar_bg"], (health_bar_x, health_bar_y, health_bar_width, health_bar_height))
         pygame.draw.rect(screen, COLORS["health_bar_fill"], (health_bar_x, health_bar_y, health_bar_width * health_percent, health_bar_height))
 
-        # Update rect for collision detection
-        self.rect = pygame.Rect(self.x, self.y, self.size, self.size)
-
 
     def update(self, dt):
         if not self.alive:
             return
 
-        if self.path_index < len(self.path):
-            self.target_pos = self.path[self.path_index]
+        if self.cell is not None:
             target_center_x, target_center_y = self.target_pos
 
             # Calculate vector to target
@@ -309,8 +453,10 @@ class Enemy(GameObject):
             if distance < self.speed * dt: # Reached current target node
                 self.x = target_center_x - self.size // 2
                 self.y = target_center_y - self.size // 2
-                self.path_index += 1
-                if self.path_index >= len(self.path):
+                self.cell = self.next_cell()
+                if self.cell is not None:
+                    self.target_pos = grid_to_world(self.cell)
+                else:
                     self.reached_end = True
                     self.alive = False # Enemy reached the end, "escaped"
             else:
@@ -323,48 +469,117 @@ class Enemy(GameObject):
             self.reached_end = True
             self.alive = False
 
+        # Update rect for collision detection
+        self.rect = pygame.Rect(self.x, self.y, self.size, self.size)
+
+    def next_cell(self):
+        """The next step towards the end, picked at random where the route forks; None once at the end."""
+        if self.cell == self.routes.end:
+            return None
+        options = self.routes.next_steps(self.cell)
+        return self.rng.choice(options) if len(options) > 1 else options[0]
+
     def take_damage(self, amount):
         self.health -= amount
         if self.health <= 0:
             self.health = 0
             self.alive = False
 
-class Projectile(GameObject):
-    def __init__(self, start_pos, target_enemy, damage, color):
-        super().__init__(start_pos[0], start_pos[1])
-        self.target_enemy = target_enemy
-        self.damage = damage
+class EnemyGrid:
+    """Uniform grid of enemy centres, rebuilt once per step, so traps only look at enemies in nearby cells."""
+
+    def __init__(self, cell_size=ENEMY_GRID_CELL):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def rebuild(self, enemies):
+        self.cells = cells = {}
+        size = self.cell_size
+        for enemy in enemies:
+            if enemy.alive:
+                half = enemy.size // 2
+                key = (int((enemy.x + half) // size), int((enemy.y + half) // size))
+                if key in cells: cells[key].append(enemy)
+                else: cells[key] = [enemy]
+
+    def query(self, pos, radius):
+        """Enemies in the cells overlapping the square of half-width radius around pos (a superset of the circle)."""
+        size, cells = self.cell_size, self.cells
+        x0, x1 = int((pos[0] - radius) // size), int((pos[0] + radius) // size)
+        y0, y1 = int((pos[1] - radius) // size), int((pos[1] + radius) // size)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket: yield from bucket
+
+    def nearest(self, pos, radius):
+        """Closest live enemy whose centre is within radius of pos, or None."""
+        best, best_d2 = None, radius * radius
+        px, py = pos
+        for enemy in self.query(pos, radius):
+            if not enemy.alive: continue # Killed earlier this step
+            half = enemy.size // 2
+            dx, dy = enemy.x + half - px, enemy.y + half - py
+            d2 = dx * dx + dy * dy
+            if d2 <= best_d2 and (best is None or d2 < best_d2):
+                best, best_d2 = enemy, d2
+        return best
+
+
+class Projectiles:
+    """All live projectiles as parallel NumPy arrays, so each step moves every one of them in a few array operations.
+    Each projectile homes in on its target enemy and is dropped if the target dies first."""
+
+    def __init__(self, color=COLORS["projectile"]):
         self.color = color
-        self.speed = 10 # Pixels per frame
-        self.size = 5
-        self.alive = True
-
-    def draw(self, screen):
-        if self.alive:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+        self.pos = np.empty((0, 2))
+        self.prev = np.empty((0, 2)) # Positions at the start of the step, for interpolated drawing
+        self.damage = np.empty(0, dtype=int)
+        self.targets = []
+        self.pending = [] # (x, y, damage, target) fired since the last update
+
+    def __len__(self):
+        return len(self.targets) + len(self.pending)
+
+    def fire(self, start_pos, target_enemy, damage):
+        self.pending.append((start_pos[0], start_pos[1], damage, target_enemy))
+
+    def _add_pending(self):
+        new = np.array([p[:2] for p in self.pending], dtype=float)
+        self.pos = np.concatenate((self.pos, new))
+        self.prev = np.concatenate((self.prev, new))
+        self.damage = np.concatenate((self.damage, np.array([p[2] for p in self.pending], dtype=int)))
+        self.targets.extend(p[3] for p in self.pending)
+        self.pending = []
 
     def update(self, dt):
-        if not self.alive:
+        if self.pending:
+            self._add_pending()
+        targets = self.targets
+        if not targets:
             return
-
-        if self.target_enemy.alive:
-            target_x, target_y = self.target_enemy.x + self.target_enemy.size // 2, self.target_enemy.y + self.target_enemy.size // 2
-            dx = target_x - self.x
-            dy = target_y - self.y
-            distance = math.hypot(dx, dy)
-
-            if distance < self.speed * dt:
-                self.x = target_x
-                self.y = target_y
-                self.target_enemy.take_damage(self.damage)
-                self.alive = False
-            else:
-                direction_x = dx / distance
-                direction_y = dy / distance
-                self.x += direction_x * self.speed * dt
-                self.y += direction_y * self.speed * dt
-        else:
-            self.alive = False # Target died before projectile reached it
+        self.prev = self.pos.copy()
+        alive = np.fromiter((t.alive for t in targets), dtype=bool, count=len(targets))
+        aim = np.array([(t.x + t.size // 2, t.y + t.size // 2) for t in targets], dtype=float)
+        delta = aim - self.pos
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        step = PROJECTILE_SPEED * dt
+        hit = alive & (distance < step)
+        moving = alive & ~hit
+        self.pos[moving] += delta[moving] * (step / distance[moving])[:, None]
+        for i in np.flatnonzero(hit):
+            if targets[i].alive: # An earlier hit this step may already have killed it
+                targets[i].take_damage(int(self.damage[i]))
+        self.pos, self.prev, self.damage = self.pos[moving], self.prev[moving], self.damage[moving]
+        self.targets = [t for t, keep in zip(targets, moving) if keep]
+
+    def draw(self, screen, camera, alpha=1.0):
+        if not self.targets:
+            return
+        ox, oy = camera.offset
+        for x, y in (self.prev + (self.pos - self.prev) * alpha).tolist():
+            if camera.is_visible(x, y):
+                pygame.draw.circle(screen, self.color, (int(x - ox), int(y - oy)), PROJECTILE_SIZE)
 
 class UI:
     def __init__(self, screen_width, screen_height):
@@ -398,96 +613,157 @@ class UI:
             btn_rect = pygame.Rect(btn_x, btn_y, button_width, button_height)
             self.trap_buttons[trap_type] = {"rect": btn_rect, "cost": props["cost"]}
 
+        # Render caches: labels by slot, button faces by state, and the whole panel by the values shown on it
+        self.labels = {} # slot -> ((text, color), surface)
+        self.button_faces = {} # (trap_type, selected, affordable) -> surface
+        self.panel_surface = pygame.Surface(self.panel_rect.size)
+        self.panel_key = None
+
+    def label(self, slot, text, color=COLORS["text"]):
+        """Rendered text for a UI slot; only re-rendered when that slot's text or color changes."""
+        cached = self.labels.get(slot)
+        if cached is None or cached[0] != (text, color):
+            cached = self.labels[slot] = ((text, color), self.font.render(text, True, color))
+        return cached[1]
+
+    def button_face(self, trap_type, selected, affordable):
+        key = (trap_type, selected, affordable)
+        if key not in self.button_faces:
+            rect = self.trap_buttons[trap_type]["rect"]
+            face = pygame.Surface(rect.size)
+            local = face.get_rect()
+            color = TRAP_TYPES[trap_type]["color"]
+            face.fill((50, 50, 50)) # Button background
+            # Highlight if selected for placement
+            if selected:
+                pygame.draw.rect(face, COLORS["selection_highlight"], local, 3) # Thicker border
+            else:
+                pygame.draw.rect(face, COLORS["ui_border"], local, 1)
+
+            # Draw a mini-representation of the trap
+            if trap_type == "spike":
+                pygame.draw.polygon(face, color, [
+                    (local.centerx - local.width // 6, local.centery + local.height // 6),
+                    (local.centerx, local.centery - local.height // 6),
+                    (local.centerx + local.width // 6, local.centery + local.height // 6)
+                ])
+            elif trap_type == "magic":
+                pygame.draw.circle(face, color, (local.centerx, local.centery), local.width // 4)
+                pygame.draw.circle(face, (255, 255, 255), (local.centerx, local.centery), local.width // 8)
+
+            cost_text = self.font.render(f"${self.trap_buttons[trap_type]['cost']}", True,
+                                         COLORS["text"] if affordable else (150, 150, 150))
+            face.blit(cost_text, (local.centerx - cost_text.get_width() // 2, local.bottom - cost_text.get_height() - 5))
+            type_text = self.font.render(trap_type.capitalize(), True, COLORS["text"])
+            face.blit(type_text, (local.centerx - type_text.get_width() // 2, local.top + 5))
+            self.button_faces[key] = face
+        return self.button_faces[key]
 
     def draw(self, screen, game_state):
+        key = (game_state.money, game_state.score, game_state.wave_number, game_state.lives,
+               game_state.wave_active, game_state.placing_trap)
+        if key != self.panel_key: # Only recomposite the panel when something on it changed
+            self.panel_key = key
+            self.render_panel(game_state)
+        screen.blit(self.panel_surface, self.panel_rect)
+
+    def render_panel(self, game_state):
+        panel, top = self.panel_surface, self.panel_rect.top
         # Draw UI panel background
-        pygame.draw.rect(screen, COLORS["ui_panel"], self.panel_rect)
-        pygame.draw.rect(screen, COLORS["ui_border"], self.panel_rect, 2)
+        panel.fill(COLORS["ui_panel"])
+        pygame.draw.rect(panel, COLORS["ui_border"], panel.get_rect(), 2)
 
         # Game Stats
-        money_text = self.font.render(f"Money: ${game_state['money']}", True, COLORS["text"])
-        score_text = self.font.render(f"Score: {game_state['score']}", True, COLORS["text"])
-        wave_text = self.font.render(f"Wave: {game_state['wave_number']}", True, COLORS["text"])
-        lives_text = self.font.render(f"Lives: {game_state['lives']}", True, COLORS["text"])
+        money_text = self.label("money", f"Money: ${game_state.money}")
+        score_text = self.label("score", f"Score: {game_state.score}")
+        wave_text = self.label("wave", f"Wave: {game_state.wave_number}")
+        lives_text = self.label("lives", f"Lives: {game_state.lives}")
 
-        screen.blit(money_text, (self.screen_width - money_text.get_width() - 10, self.panel_rect.top + 10))
-        screen.blit(score_text, (self.screen_width - score_text.get_width() - 10, self.panel_rect.top + 30))
-        screen.blit(wave_text, (self.screen_width - wave_text.get_width() - 10, self.panel_rect.top + 50))
-        screen.blit(lives_text, (self.screen_width - lives_text.get_width() - 10, self.panel_rect.top + 70))
+        panel.blit(money_text, (self.screen_width - money_text.get_width() - 10, 10))
+        panel.blit(score_text, (self.screen_width - score_text.get_width() - 10, 30))
+        panel.blit(wave_text, (self.screen_width - wave_text.get_width() - 10, 50))
+        panel.blit(lives_text, (self.screen_width - lives_text.get_width() - 10, 70))
 
         # Draw Start Wave Button
-        start_btn_rect = self.start_wave_button["rect"]
-        start_btn_text = self.start_wave_button["text"]
+        start_btn_rect = self.start_wave_button["rect"].move(0, -top)
 
         # If wave is active, make button inactive/greyed out
-        btn_color = COLORS["ui_border"] if not game_state["wave_active"] else (80, 80, 80)
-        text_color = COLORS["text"] if not game_state["wave_active"] else (150, 150, 150)
+        btn_color = COLORS["ui_border"] if not game_state.wave_active else (80, 80, 80)
+        text_color = COLORS["text"] if not game_state.wave_active else (150, 150, 150)
 
-        pygame.draw.rect(screen, btn_color, start_btn_rect, 2)
-        pygame.draw.rect(screen, (50, 50, 50), start_btn_rect)
+        pygame.draw.rect(panel, (50, 50, 50), start_btn_rect)
+        pygame.draw.rect(panel, btn_color, start_btn_rect, 2)
 
-        start_text_surface = self.font.render(start_btn_text, True, text_color)
-        screen.blit(start_text_surface, (start_btn_rect.centerx - start_text_surface.get_width() // 2,
-                                         start_btn_rect.centery - start_text_surface.get_height() // 2))
+        start_text_surface = self.label("start_wave", self.start_wave_button["text"], text_color)
+        panel.blit(start_text_surface, (start_btn_rect.centerx - start_text_surface.get_width() // 2,
+                                        start_btn_rect.centery - start_text_surface.get_height() // 2))
 
         # Trap Placement Buttons
         for trap_type, data in self.trap_buttons.items():
-            rect = data["rect"]
-            color = TRAP_TYPES[trap_type]["color"]
-
-            # Highlight if selected for placement
-            if game_state["placing_trap"] == trap_type:
-                pygame.draw.rect(screen, COLORS["selection_highlight"], rect, 3) # Thicker border
-            else:
-                pygame.draw.rect(screen, COLORS["ui_border"], rect, 1)
-
-            pygame.draw.rect(screen, (50, 50, 50), rect) # Button background
-
-            # Draw a mini-representation of the trap
-            if trap_type == "spike":
-                pygame.draw.polygon(screen, color, [
-                    (rect.centerx - rect.width // 6, rect.centery + rect.height // 6),
-                    (rect.centerx, rect.centery - rect.height // 6),
-                    (rect.centerx + rect.width // 6, rect.centery + rect.height // 6)
-                ])
-            elif trap_type == "magic":
-                pygame.draw.circle(screen, color, (rect.centerx, rect.centery), rect.width // 4)
-                pygame.draw.circle(screen, (255, 255, 255), (rect.centerx, rect.centery), rect.width // 8)
-
-            cost_text = self.font.render(f"${data['cost']}", True, COLORS["text"])
-            screen.blit(cost_text, (rect.centerx - cost_text.get_width() // 2, rect.bottom - cost_text.get_height() - 5))
-            type_text = self.font.render(trap_type.capitalize(), True, COLORS["text"])
-            screen.blit(type_text, (rect.centerx - type_text.get_width() // 2, rect.top + 5))
-
+            face = self.button_face(trap_type, game_state.placing_trap == trap_type, game_state.money >= data["cost"])
+            panel.blit(face, data["rect"].move(0, -top))
 
     def handle_click(self, mouse_pos, game_state):
         if self.panel_rect.collidepoint(mouse_pos):
             for trap_type, data in self.trap_buttons.items():
                 if data["rect"].collidepoint(mouse_pos):
-                    if game_state["money"] >= data["cost"]:
-                        game_state["placing_trap"] = trap_type
+                    if game_state.money >= data["cost"]:
+                        game_state.placing_trap = trap_type
                     else:
                         print("Not enough money!")  # Or show an in-game message
                     return True
 
             # Handle Start Wave button click
             if self.start_wave_button["rect"].collidepoint(mouse_pos):
-                if not game_state["wave_active"]:
-                    game_state["start_wave_requested"] = True # Signal to Game to start wave
+                if not game_state.wave_active:
+                    game_state.start_wave_requested = True # Signal to Game to start wave
                     return True  # Click handled
             return False  # Click was in UI panel but not on an interactive element
         return False  # Click was outside UI panel
 
 
 
+class PlacementPreview:
+    """Translucent ghost of the trap being placed, rendered once per trap type and reused every frame."""
+    GHOST_ALPHA = 100
+
+    def __init__(self):
+        self.ghosts = {} # trap_type -> (surface, (dx, dy) from the cell's top-left corner)
+
+    def ghost(self, trap_type):
+        if trap_type not in self.ghosts:
+            trap = Trap(0, 0, trap_type)
+            trap.is_active = True # To draw range
+            margin = trap.range # The range ring extends past the cell
+            surface = pygame.Surface((CELL_SIZE + 2 * margin, CELL_SIZE + 2 * margin), pygame.SRCALPHA)
+            trap.draw(surface, (-margin, -margin))
+            surface.set_alpha(self.GHOST_ALPHA)
+            self.ghosts[trap_type] = (surface, (-margin, -margin))
+        return self.ghosts[trap_type]
+
+    def draw(self, screen, trap_type, grid_pos, offset, placeable):
+        x, y = grid_pos[0] * CELL_SIZE - offset[0], grid_pos[1] * CELL_SIZE - offset[1]
+        surface, (dx, dy) = self.ghost(trap_type)
+        screen.blit(surface, (x + dx, y + dy))
+        if placeable: # Highlight potential placement slot
+            pygame.draw.rect(screen, COLORS["selection_highlight"], (x, y, CELL_SIZE, CELL_SIZE), 3)
+
+
 # --- Game Logic ---
 class Game:
-    def __init__(self):
+    def __init__(self, dungeon_file=None, headless=False, grid=None, seed=None):
         pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Dungeon Defense")
+        self.headless = headless
+        if headless: # Off-screen surface only, for tests and benchmarks driving step()
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Dungeon Defense")
         self.clock = pygame.time.Clock()
         self.running = True
+        self.time_scale = 1
+        self.state = GameState()
+        self.rng = random.Random(seed) # Enemy route choices, per game so simulations are reproducible
 
         # Example Grid (can be loaded from a file later)
         # #: Wall, P: Path, S: Start, E: End, T: Trap Slot
@@ -497,7 +773,7 @@ class Game:
             list("##P#################"),
             list("##P####T###########P"),
             list("##P#############T##P"),
-            list("##P#####P##########P"),
+            list("##PPPPPPP##########P"),
             list("########P###T######P"),
             list("########P##########P"),
             list("########P####T#####P"),
@@ -513,21 +789,32 @@ class Game:
             list("####T###E##########P"),
             list("####################")
         ]
+        if dungeon_file:
+            self.dungeon_grid = load_dungeon(dungeon_file)
+        elif grid:
+            self.dungeon_grid = [list(row) for row in grid]
         self.map = Map(self.dungeon_grid)
         self.ui = UI(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.camera = Camera(SCREEN_WIDTH, VIEW_HEIGHT, len(self.dungeon_grid[0]) * CELL_SIZE,
+                             len(self.dungeon_grid) * CELL_SIZE)
+        if self.map.start_node:
+            self.camera.center_on((self.map.start_node.x, self.map.start_node.y))
 
         self.traps = []
         self.enemies = []
-        self.projectiles = []
+        self.projectiles = Projectiles()
+        self.enemy_grid = EnemyGrid()
         self.placed_trap_slots = set() # Store (grid_x, grid_y) of occupied slots
+        self.free_trap_slots = set(self.map.trap_slots) # Slots still open for placement
+        self.placement_preview = PlacementPreview()
 
         # Wave Management
         self.wave_data = {
-            1: {"enemies": [("goblin", 5)], "spawn_delay": 60},  # 5 goblins, 60 frames between each
-            2: {"enemies": [("goblin", 10), ("orc", 2)], "spawn_delay": 50},
-            3: {"enemies": [("goblin", 15), ("orc", 5)], "spawn_delay": 40},
-            4: {"enemies": [("orc", 8), ("goblin", 10)], "spawn_delay": 35},
-            5: {"enemies": [("goblin", 20), ("orc", 10)], "spawn_delay": 30},
+            1: {"enemies": [("goblin", 5)], "spawn_delay": 1.0},  # 5 goblins, 1 second between each
+            2: {"enemies": [("goblin", 10), ("orc", 2)], "spawn_delay": 0.83},
+            3: {"enemies": [("goblin", 15), ("orc", 5)], "spawn_delay": 0.67},
+            4: {"enemies": [("orc", 8), ("goblin", 10)], "spawn_delay": 0.58},
+            5: {"enemies": [("goblin", 20), ("orc", 10)], "spawn_delay": 0.5},
             # Add more waves for scalability
         }
         self.current_wave_enemies_to_spawn = []
@@ -535,21 +822,36 @@ class Game:
         self.spawn_delay = 0
 
     def start_wave(self):
-        GAME_STATE["wave_number"] += 1
-        if GAME_STATE["wave_number"] in self.wave_data:
-            wave_info = self.wave_data[GAME_STATE["wave_number"]]
+        self.state.wave_number += 1
+        if self.state.wave_number in self.wave_data:
+            wave_info = self.wave_data[self.state.wave_number]
             self.current_wave_enemies_to_spawn = []
             for enemy_type, count in wave_info["enemies"]:
                 for _ in range(count):
                     self.current_wave_enemies_to_spawn.append(enemy_type)
             self.spawn_delay = wave_info["spawn_delay"]
             self.spawn_timer = 0
-            GAME_STATE["wave_active"] = True
-            print(f"Starting Wave {GAME_STATE['wave_number']}!")
+            self.state.wave_active = True
+            print(f"Starting Wave {self.state.wave_number}!")
         else:
             print("No more waves defined! You win (for now!)")
             self.running = False
 
+    def place_trap(self, grid_pos, trap_type):
+        """Buys and places a trap on a free slot. Returns False if the slot is taken or money is short."""
+        if grid_pos not in self.free_trap_slots:
+            print("Cannot place trap here (not a slot or occupied).")
+            return False
+        trap_cost = TRAP_TYPES[trap_type]["cost"]
+        if self.state.money < trap_cost:
+            print("Not enough money for this trap!")
+            return False
+        self.traps.append(Trap(grid_pos[0], grid_pos[1], trap_type))
+        self.placed_trap_slots.add(grid_pos)
+        self.free_trap_slots.discard(grid_pos)
+        self.state.money -= trap_cost
+        return True
+
     def handle_input(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -557,148 +859,123 @@ class Game:
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
                     mouse_x, mouse_y = event.pos
-                    if self.ui.handle_click((mouse_x, mouse_y), GAME_STATE):
+                    if self.ui.handle_click((mouse_x, mouse_y), self.state):
                         # UI handled the click
                         pass
-                    if GAME_STATE["start_wave_requested"]:
+                    if self.state.start_wave_requested:
                         self.start_wave()
-                        GAME_STATE["start_wave_requested"] = False  # Reset the flag
-                    elif GAME_STATE["placing_trap"] and mouse_y < SCREEN_HEIGHT - self.ui.panel_height:
+                        self.state.start_wave_requested = False  # Reset the flag
+                    elif self.state.placing_trap and mouse_y < SCREEN_HEIGHT - self.ui.panel_height:
                         # Attempt to place a trap
-                        grid_x, grid_y = world_to_grid((mouse_x, mouse_y))
-                        if (grid_x, grid_y) in self.map.trap_slots and (grid_x, grid_y) not in self.placed_trap_slots:
-                            trap_type_to_place = GAME_STATE["placing_trap"]
-                            trap_cost = TRAP_TYPES[trap_type_to_place]["cost"]
-                            if GAME_STATE["money"] >= trap_cost:
-                                self.traps.append(Trap(grid_x, grid_y, trap_type_to_place))
-                                self.placed_trap_slots.add((grid_x, grid_y))
-                                GAME_STATE["money"] -= trap_cost
-                                GAME_STATE["placing_trap"] = None # Reset placement mode
-                            else:
-                                print("Not enough money for this trap!")
-                        else:
-                            print("Cannot place trap here (not a slot or occupied).")
+                        grid_pos = world_to_grid(self.camera.screen_to_world((mouse_x, mouse_y)))
+                        if self.place_trap(grid_pos, self.state.placing_trap):
+                            self.state.placing_trap = None # Reset placement mode
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
-                    if not GAME_STATE["wave_active"] and not self.current_wave_enemies_to_spawn:
+                    if not self.state.wave_active and not self.current_wave_enemies_to_spawn:
                         self.start_wave()
+                elif event.key == pygame.K_f:
+                    speeds = FAST_FORWARD_SPEEDS
+                    self.time_scale = speeds[(speeds.index(self.time_scale) + 1) % len(speeds)]
+
+        # Arrow keys scroll the camera over dungeons larger than the view
+        keys = pygame.key.get_pressed()
+        self.camera.scroll((keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * SCROLL_SPEED,
+                           (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * SCROLL_SPEED)
 
     def update(self, dt):
+        for enemy in self.enemies:
+            enemy.prev_x, enemy.prev_y = enemy.x, enemy.y
+
         # Enemy Spawning
-        if GAME_STATE["wave_active"] and self.current_wave_enemies_to_spawn:
+        if self.state.wave_active and self.current_wave_enemies_to_spawn:
             self.spawn_timer += dt
             if self.spawn_timer >= self.spawn_delay:
                 enemy_type = self.current_wave_enemies_to_spawn.pop(0)
-                start_pos_world = self.map.enemy_path[0] if self.map.enemy_path else (0,0)
-                self.enemies.append(Enemy(enemy_type, self.map.enemy_path, start_pos_world))
-                self.spawn_timer = 0
-        elif GAME_STATE["wave_active"] and not self.current_wave_enemies_to_spawn and not self.enemies:
+                self.enemies.append(Enemy(enemy_type, self.map.routes, self.rng))
+                self.spawn_timer -= self.spawn_delay
+        elif self.state.wave_active and not self.current_wave_enemies_to_spawn and not self.enemies:
             # All enemies spawned and defeated
-            GAME_STATE["wave_active"] = False
+            self.state.wave_active = False
             print("Wave complete!")
-            GAME_STATE["money"] += 100 # Bonus for completing wave
+            self.state.money += 100 # Bonus for completing wave
 
         # Update enemies
-        for enemy in list(self.enemies): # Iterate over a copy to allow modification
+        for enemy in self.enemies:
             enemy.update(dt)
             if not enemy.alive:
                 if enemy.reached_end:
-                    GAME_STATE["lives"] -= 1
-                    print(f"Enemy escaped! Lives left: {GAME_STATE['lives']}")
-                else:
-                    GAME_STATE["money"] += enemy.reward
-                    GAME_STATE["score"] += enemy.reward
-                self.enemies.remove(enemy)
-        # Update traps
-        for trap in self.traps:
-            # For ranged traps, we'll implement projectile logic here for simplicity
-            if trap.type == "arrow" or trap.type == "magic":  # Assuming these are ranged
-                if trap.cooldown_current <= 0:
-                    target = None
-                    # Find closest enemy in range
-                    closest_dist = float('inf')
-                    for enemy in self.enemies:
-                        dist = trap.distance_to(enemy)
-                        if dist <= trap.range and dist < closest_dist:
-                            closest_dist = dist
-                            target = enemy
-                    if target:
-                        # Create a projectile
-                        projectile_start_pos = (trap.x + CELL_SIZE // 2, trap.y + CELL_SIZE // 2)
-                        self.projectiles.append(
-                            Projectile(projectile_start_pos, target, trap.damage, COLORS["projectile"]))
-                        trap.cooldown_current = trap.cooldown_max
-                        trap.is_active = True  # Indicate it just fired
+                    self.state.lives -= 1
+                    print(f"Enemy escaped! Lives left: {self.state.lives}")
                 else:
-                    trap.cooldown_current -= dt
-                    trap.is_active = False  # Reset active state after firing
+                    self.state.money += enemy.reward
+                    self.state.score += enemy.reward
+        self.enemies = [enemy for enemy in self.enemies if enemy.alive]
 
-            else:  # Melee traps (like spikes)
-                trap.update(dt, self.enemies)  # Pass enemies for collision detection
-
-        # Update projectiles
-        for projectile in list(self.projectiles):
-            projectile.update(dt)
-            if not projectile.alive:
-                self.projectiles.remove(projectile)
+        self.update_traps(dt)
+        self.projectiles.update(dt)
 
         # Check for Game Over
-        if GAME_STATE["lives"] <= 0:
+        if self.state.lives <= 0:
             print("Game Over!")
             self.running = False
 
-    def draw(self):
+    def update_traps(self, dt):
+        """One targeting path for all trap types, backed by the enemy grid."""
+        self.enemy_grid.rebuild(self.enemies)
+        for trap in self.traps:
+            trap.update(dt, self.enemy_grid, self.projectiles)
+
+    def draw(self, alpha=1.0):
+        """alpha is how far the real time is between the last simulation step and the next (0..1)."""
         self.screen.fill(COLORS["background"])
+        camera, offset = self.camera, self.camera.offset
 
-        self.map.draw(self.screen)
+        self.map.draw(self.screen, camera)
 
         for trap in self.traps:
-            trap.draw(self.screen)
-            # If placing a trap, draw its ghost image and range
-            if GAME_STATE["placing_trap"]:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                grid_x, grid_y = world_to_grid((mouse_x, mouse_y))
-                temp_trap = Trap(grid_x, grid_y, GAME_STATE["placing_trap"])
-                temp_trap.is_active = True  # To draw range
-
-                # Draw translucent ghost
-                s = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-                temp_trap.draw(s)
-                s.set_alpha(100)  # Transparency
-                self.screen.blit(s, (grid_x * CELL_SIZE, grid_y * CELL_SIZE))
-
-                # Highlight potential placement slot
-                if (grid_x, grid_y) in self.map.trap_slots and (grid_x, grid_y) not in self.placed_trap_slots:
-                    pygame.draw.rect(self.screen, COLORS["selection_highlight"],
-                                     (grid_x * CELL_SIZE, grid_y * CELL_SIZE, CELL_SIZE, CELL_SIZE), 3)
+            if camera.is_visible(trap.x, trap.y, trap.range + CELL_SIZE): trap.draw(self.screen, offset)
+
+        # If placing a trap, draw its ghost image and range at the hovered cell
+        mouse_pos = pygame.mouse.get_pos()
+        if self.state.placing_trap and mouse_pos[1] < VIEW_HEIGHT:
+            grid_pos = world_to_grid(camera.screen_to_world(mouse_pos))
+            self.placement_preview.draw(self.screen, self.state.placing_trap, grid_pos, offset,
+                                        grid_pos in self.free_trap_slots)
 
         for enemy in self.enemies:
-            enemy.draw(self.screen)
+            if camera.is_visible(enemy.x, enemy.y): enemy.draw(self.screen, enemy.render_offset(offset, alpha))
 
-        for projectile in self.projectiles:
-            projectile.draw(self.screen)
+        self.projectiles.draw(self.screen, camera, alpha)
 
-        self.ui.draw(self.screen, GAME_STATE)
+        self.ui.draw(self.screen, self.state)
+        if self.time_scale != 1:
+            speed_text = self.ui.label("speed", f"Speed x{self.time_scale} (F)", COLORS["selection_highlight"])
+            self.screen.blit(speed_text, (self.ui.start_wave_button["rect"].right + 20, self.ui.panel_rect.top + 10))
 
-        pygame.display.flip()
+        if not self.headless:
+            pygame.display.flip()
+
+    def step(self, steps=1):
+        """Advances the simulation by whole fixed steps as fast as possible, without input or drawing."""
+        for _ in range(steps):
+            self.update(SIM_DT)
 
     def run(self):
-        dt = 0
+        accumulator = 0.0
         while self.running:
             self.handle_input()
-            self.update(dt)
-            self.draw()
-
-            dt = self.clock.tick(60) / 1000.0  # dt in seconds for smooth movement
-            # We will use dt as frames for simplicity for now since cooldowns are in frames
-            # For more accurate time-based movement, multiply speeds by dt
-            # For this simple example, dt will be roughly 1 for 60fps if we divide by (1000/60)
-            dt = 1  # Simplified for initial frame-based updates. For real game use actual dt.
+            frame_time = min(self.clock.tick(60) / 1000.0, MAX_FRAME_TIME)
+            accumulator += frame_time * self.time_scale
+            while accumulator >= SIM_DT and self.running:
+                self.update(SIM_DT)
+                accumulator -= SIM_DT
+            self.draw(accumulator / SIM_DT)
 
         pygame.quit()
 
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    game = Game()
+    game = Game(sys.argv[1] if len(sys.argv) > 1 else None)
     game.run()
\ No newline at end of file
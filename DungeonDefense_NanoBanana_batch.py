@@ -0,0 +1,79 @@
+import sys
+import time
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark_common import quiet
+import DungeonDefense_NanoBanana as nb
+
+DUNGEON_WIDTH = 40
+DUNGEON_HEIGHT = 30
+TRAP_SLOTS = 16
+MAX_WAVE_SECONDS = 600 # Give up on a wave that has not finished after this much simulated time
+
+
+def random_dungeon(seed, width=DUNGEON_WIDTH, height=DUNGEON_HEIGHT, trap_slots=TRAP_SLOTS):
+    """A single corridor from the top-left to the bottom-right in runs of 2-6 cells, with trap slots beside it.
+    The walk only ever moves right or down, so the corridor never touches itself."""
+    rng = random.Random(seed)
+    grid = [['#'] * width for _ in range(height)]
+    x, y = 1, 1
+    cells = [(x, y)]
+    while (x, y) != (width - 2, height - 2):
+        dx, dy = rng.choice([(1, 0), (0, 1)])
+        for _ in range(rng.randint(2, 6)):
+            if x + dx > width - 2 or y + dy > height - 2: break
+            x, y = x + dx, y + dy
+            cells.append((x, y))
+    for cx, cy in cells: grid[cy][cx] = 'P'
+    grid[1][1], grid[height - 2][width - 2] = 'S', 'E'
+    beside = sorted({(cx + ox, cy + oy) for cx, cy in cells for ox, oy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                     if grid[cy + oy][cx + ox] == '#'})
+    for cx, cy in rng.sample(beside, min(trap_slots, len(beside))): grid[cy][cx] = 'T'
+    return [''.join(row) for row in grid]
+
+
+def simulate(seed):
+    """Plays every defined wave of one generated dungeon with a random trap layout. Returns the per-wave outcomes."""
+    rng = random.Random(seed)
+    with quiet():
+        game = nb.Game(headless=True, grid=random_dungeon(seed), seed=seed)
+        slots = sorted(game.free_trap_slots)
+        rng.shuffle(slots)
+        for slot in slots:
+            game.place_trap(slot, rng.choice(list(nb.TRAP_TYPES)))
+        waves, steps, began = [], 0, time.perf_counter()
+        for _ in game.wave_data:
+            state = game.state
+            lives, score, wave_steps = state.lives, state.score, 0
+            game.start_wave()
+            while game.running and state.wave_active and wave_steps * nb.SIM_DT < MAX_WAVE_SECONDS:
+                game.step()
+                wave_steps += 1
+            steps += wave_steps
+            waves.append({"wave": state.wave_number, "lives_lost": lives - state.lives,
+                          "reward": state.score - score, "seconds": wave_steps * nb.SIM_DT})
+            if not game.running: break
+    return {"seed": seed, "traps": len(game.traps), "waves": waves, "lives": game.state.lives,
+            "steps": steps, "wall_seconds": time.perf_counter() - began}
+
+
+if __name__ == "__main__":
+    # Arguments: number of dungeons (default 8) and worker processes (default: one per CPU)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    began = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(simulate, range(count)))
+    elapsed = time.perf_counter() - began
+
+    wave_count = max(len(r["waves"]) for r in results)
+    print(f"{'Seed':<6}{'Traps':>6}" + "".join(f"{'W' + str(i + 1) + ' lost':>9}" for i in range(wave_count))
+          + f"{'Lives':>7}{'Sim fps':>10}")
+    for r in results:
+        lost = "".join(f"{w['lives_lost']:>9}" for w in r["waves"]) + " " * 9 * (wave_count - len(r["waves"]))
+        print(f"{r['seed']:<6}{r['traps']:>6}{lost}{r['lives']:>7}{r['steps'] / r['wall_seconds']:>10.0f}")
+    total_steps = sum(r["steps"] for r in results)
+    survived = sum(r["lives"] > 0 for r in results)
+    print(f"\n{count} dungeons, {survived} survived all waves, {total_steps} simulated frames in {elapsed:.2f}s "
+          f"= {total_steps / elapsed:.0f} simulated frames/s across the pool")
@@ -0,0 +1,73 @@
+import sys
+import time
+import random
+
+from benchmark_common import quiet, spread_along_path
+import DungeonDefense_NanoBanana as nb
+from DungeonDefense_NanoBanana_batch import random_dungeon
+
+TRAP_COUNT = 100
+ENEMY_COUNT = 2000
+FRAMES = 120
+
+
+class EnemyList(nb.EnemyGrid):
+    """Targeting as it was before the enemy grid: every query hands back the whole enemy list, as the old
+    Trap.update loops did. nearest() is inherited, so both runs pick the same targets."""
+
+    def rebuild(self, enemies):
+        self.enemies = enemies
+
+    def query(self, pos, radius):
+        return iter(self.enemies)
+
+
+def build_scene(seed=1):
+    """A 80x60 dungeon with a trap in every slot and ENEMY_COUNT enemies that never die, spread along the route."""
+    rng = random.Random(seed)
+    game = nb.Game(headless=True, grid=random_dungeon(seed, 80, 60, trap_slots=TRAP_COUNT), seed=seed)
+    game.state.money = game.state.lives = 10 ** 9
+    for i, slot in enumerate(sorted(game.free_trap_slots)):
+        game.place_trap(slot, list(nb.TRAP_TYPES)[i % len(nb.TRAP_TYPES)])
+    cells = game.map.routes.cells()
+    path = [nb.grid_to_world(cell) for cell in cells]
+    for i, (x, y) in spread_along_path(path, ENEMY_COUNT, rng):
+        enemy = nb.Enemy(rng.choice(list(nb.ENEMY_TYPES)), game.map.routes, rng)
+        enemy.x, enemy.y = x - enemy.size // 2, y - enemy.size // 2
+        enemy.cell, enemy.target_pos = cells[i + 1], path[i + 1]
+        enemy.max_health = enemy.health = 10 ** 9
+        game.enemies.append(enemy)
+    return game
+
+
+def run(index_factory):
+    """Milliseconds per step for the whole step and for Game.update_traps alone (index rebuild, targeting and
+    firing), plus the scene size."""
+    with quiet():
+        game = build_scene()
+        game.enemy_grid = index_factory()
+        update_traps, trap_seconds = game.update_traps, 0.0
+
+        def timed_update_traps(dt):
+            nonlocal trap_seconds
+            began = time.perf_counter()
+            update_traps(dt)
+            trap_seconds += time.perf_counter() - began
+
+        game.update_traps = timed_update_traps
+        traps, enemies = len(game.traps), len(game.enemies)
+        peak_projectiles, began = 0, time.perf_counter()
+        for _ in range(FRAMES):
+            game.step()
+            peak_projectiles = max(peak_projectiles, len(game.projectiles))
+        elapsed = time.perf_counter() - began
+    return elapsed / FRAMES * 1000, trap_seconds / FRAMES * 1000, traps, enemies, peak_projectiles
+
+
+if __name__ == "__main__":
+    # --linear also runs the scene with EnemyList, the pre-grid targeting, for comparison
+    use_linear = "--linear" in sys.argv
+    print(f"{'Index':<8}{'Traps':>6}{'Enemies':>9}{'Peak shots':>12}{'Step ms':>9}{'Traps ms':>10}")
+    for name, factory in [("grid", nb.EnemyGrid)] + [("list", EnemyList)] * use_linear:
+        step_ms, trap_ms, traps, enemies, projectiles = run(factory)
+        print(f"{name:<8}{traps:>6}{enemies:>9}{projectiles:>12}{step_ms:>9.2f}{trap_ms:>10.2f}")
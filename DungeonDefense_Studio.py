@@ -3,6 +3,9 @@ import random
 import math
 import json
 import os
+import time
+
+from map_supply import MapSupply
 
 # --- Constants ---
 SCREEN_WIDTH = 1024
@@ -15,6 +18,8 @@ FPS = 60
 TOTAL_WAVES = 20  # Increased for a longer game
 BOSS_WAVE_INTERVAL = 5
 STATS_FILE = 'dungeon_stats.json'
+MAP_CACHE_FILE = os.path.join('dungeon_map_cache', 'dungeon_maps.json')
+SAVE_GENERATED_MAPS = True  # Keep unplayed pre-generated maps on disk for the next session
 
 # --- Colors ---
 COLOR_WALL = (50, 50, 50)
@@ -112,6 +117,137 @@ class Research:
         return False
 
 
+# --- Dungeon Generation ---
+RING_OFFSETS = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]  # Even indices are edges
+
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, a):
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb: self.parent[rb] = ra
+
+
+def shortest_path(grid, start, end):
+    """Breadth-first search over floor cells (1). Returns the cell list from start to end, or [] if unreachable."""
+    height, width = len(grid), len(grid[0])
+    came_from = {start: None}
+    frontier = [start]
+    while frontier and end not in came_from:
+        next_frontier = []
+        for x, y in frontier:
+            for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and grid[ny][nx] == 1 and (nx, ny) not in came_from:
+                    came_from[(nx, ny)] = (x, y)
+                    next_frontier.append((nx, ny))
+        frontier = next_frontier
+    if end not in came_from: return []
+    path, curr = [], end
+    while curr is not None: path.append(curr); curr = came_from[curr]
+    return path[::-1]
+
+
+class DungeonGenerator:
+    """Builds dungeon grids whose floor is connected by construction, so no retry loop is needed.
+
+    The grid starts as all floor and walls are added one cell at a time. A union-find over wall cells
+    (8-connected, with the outside of the grid as one extra node) rejects any wall that would close a
+    loop of walls around floor, which is exactly the case where the floor would be split in two.
+    With target_path_length set, extra walls are then dropped onto the current shortest path until
+    it is long enough, max_passes runs out or time_budget seconds have passed."""
+
+    def __init__(self, width, height, seed=None, wall_density=0.3, target_path_length=None, max_passes=64,
+                 time_budget=2.0):
+        self.width, self.height, self.seed = width, height, seed
+        self.wall_density, self.target_path_length = wall_density, target_path_length
+        self.max_passes, self.time_budget = max_passes, time_budget
+        self.start, self.end = (0, height // 2), (width - 1, height // 2)
+        self.report = {}
+
+    def generate(self):
+        """Returns (grid, path) with grid[y][x] == 1 for floor and 0 for wall."""
+        began = time.perf_counter()
+        rng = random.Random(self.seed)
+        w, h = self.width, self.height
+        self.grid = [[1] * w for _ in range(h)]
+        self.walls = UnionFind(w * h + 1)  # Index w * h is the border
+        candidates = [(x, y) for y in range(h) for x in range(2, w - 2)]
+        rng.shuffle(candidates)
+        walls_added, spare = 0, []
+        for x, y in candidates:
+            if rng.random() < self.wall_density:
+                walls_added += self.try_add_wall(x, y)
+            else:
+                spare.append((x, y))
+        path, passes = shortest_path(self.grid, self.start, self.end), 0
+        if self.target_path_length:
+            while (len(path) < self.target_path_length and passes < self.max_passes
+                   and time.perf_counter() - began < self.time_budget):
+                passes += 1
+                blocked = 0
+                for x, y in path[2 + passes % 3:-2:3]:  # Stagger blocks so the detours do not line up
+                    if 1 < x < w - 2: blocked += self.try_add_wall(x, y)
+                if not blocked: break
+                walls_added += blocked
+                path = shortest_path(self.grid, self.start, self.end)
+        self.report = {'width': w, 'height': h, 'seed': self.seed, 'walls': walls_added,
+                       'path_length': len(path), 'passes': passes, 'seconds': time.perf_counter() - began}
+        return self.grid, path
+
+    def try_add_wall(self, x, y):
+        """Turns (x, y) into a wall unless that would disconnect the floor. Returns True if it did."""
+        w, h, grid, walls = self.width, self.height, self.grid, self.walls
+        border = w * h
+        ring = []
+        for dx, dy in RING_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < w and 0 <= ny < h:
+                ring.append(None if grid[ny][nx] == 1 else walls.find(ny * w + nx))
+            else:
+                ring.append(walls.find(border))
+        wall_indices = [k for k in range(8) if ring[k] is not None]
+        if wall_indices and len(wall_indices) < 8:
+            # Split the ring into wall arcs separated by floor runs that touch (x, y) along an edge.
+            # A floor run that only touches a corner does not separate the walls on either side of it.
+            first, arcs, arc, floor_run = wall_indices[0], [], set(), []
+            for step in range(9):
+                k = (first + step) % 8
+                if ring[k] is None:
+                    floor_run.append(k)
+                    continue
+                if floor_run and any(i % 2 == 0 for i in floor_run):
+                    arcs.append(arc); arc = set()
+                floor_run = []
+                if step < 8: arc.add(ring[k])
+            if arc and arcs:
+                arcs[0] |= arc  # The trailing arc wraps around into the first one
+            elif arc:
+                arcs.append(arc)
+            # Two arcs already joined elsewhere would close a wall loop through (x, y) and cut off floor
+            seen = set()
+            for arc in arcs:
+                if arc & seen: return False
+                seen |= arc
+        grid[y][x] = 0
+        for root in set(r for r in ring if r is not None): walls.union(y * w + x, root)
+        return True
+
+
+def generate_dungeon_map():
+    grid, path = DungeonGenerator(GRID_WIDTH, GRID_HEIGHT).generate()
+    return grid, path, path[-1]
+
+
 # --- Game Object Classes ---
 class FloatingText(pygame.sprite.Sprite):
     def __init__(self, x, y, text, color, font):
@@ -582,6 +718,9 @@ class Game:
         self.large_font = pygame.font.SysFont("Arial", 36, bold=True)
         self.research = Research()
         self.game_state = "main_menu"
+        self.map_supply = MapSupply(generate_dungeon_map, (GRID_WIDTH, GRID_HEIGHT),
+                                    cache_file=MAP_CACHE_FILE if SAVE_GENERATED_MAPS else None)
+        self.map_supply.start()
         self.setup_ui()
 
     def setup_ui(self):
@@ -607,10 +746,7 @@ class Game:
                                                 action=lambda k=key: self.research.purchase_upgrade(k))
 
     def reset_game(self):
-        self.path_list = []
-        while not self.path_list:
-            self.grid = self.create_grid()
-            self.path_list = self.find_path()
+        self.grid, self.path_list, _ = self.map_supply.take()
         self.path_set = set(self.path_list)
         self.enemies = pygame.sprite.Group()
         self.traps = pygame.sprite.Group()
@@ -666,43 +802,13 @@ class Game:
         num_particles = 1 if is_shockwave else 15
         for _ in range(num_particles): self.particles.add(Particle(x, y, color, is_shockwave))
 
-    def create_grid(self):
-        grid = [[1 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if 1 < x < GRID_WIDTH - 2 and random.random() < 0.3: grid[y][x] = 0
-        grid[GRID_HEIGHT // 2][0] = 1
-        grid[GRID_HEIGHT // 2][GRID_WIDTH - 1] = 1
-        return grid
-
-    def find_path(self):
-        start, end = (0, GRID_HEIGHT // 2), (GRID_WIDTH - 1, GRID_HEIGHT // 2)
-        open_set, came_from = {start}, {}
-        g, f = {}, {}
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH): g[(x, y)], f[(x, y)] = float('inf'), float('inf')
-        g[start], f[start] = 0, abs(start[0] - end[0]) + abs(start[1] - end[1])
-        while open_set:
-            curr = min(open_set, key=lambda o: f.get(o, float('inf')))
-            if curr == end:
-                path = []
-                while curr in came_from: path.append(curr); curr = came_from[curr]
-                path.append(start)
-                return path[::-1]
-            open_set.remove(curr)
-            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                neighbor = (curr[0] + dx, curr[1] + dy)
-                if 0 <= neighbor[0] < GRID_WIDTH and 0 <= neighbor[1] < GRID_HEIGHT and self.grid[neighbor[1]][
-                    neighbor[0]] == 1:
-                    tentative_g = g.get(curr, float('inf')) + 1
-                    if tentative_g < g.get(neighbor, float('inf')):
-                        came_from[neighbor], g[neighbor] = curr, tentative_g
-                        f[neighbor] = g[neighbor] + abs(neighbor[0] - end[0]) + abs(neighbor[1] - end[1])
-                        if neighbor not in open_set: open_set.add(neighbor)
-        return []
-
     def set_state(self, state):
         self.game_state = state
+        # Maps are only pre-generated while the menus are open
+        if state in ("playing", "paused"):
+            self.map_supply.pause()
+        else:
+            self.map_supply.resume()
 
     def run(self):
         while self.running:
@@ -710,6 +816,7 @@ class Game:
             self.handle_events()
             self.update(dt)
             self.draw()
+        self.map_supply.close()
 
     def handle_events(self):
         mouse_pos = pygame.mouse.get_pos()
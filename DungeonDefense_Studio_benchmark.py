@@ -0,0 +1,23 @@
+import sys
+
+from DungeonDefense_Studio import DungeonGenerator, GRID_WIDTH, GRID_HEIGHT
+
+SIZES = [(GRID_WIDTH, GRID_HEIGHT), (64, 64), (128, 128), (256, 256)]
+SEEDS = range(5)
+
+
+if __name__ == "__main__":
+    # Optional argument: target path length as a multiple of the grid width, e.g. "3" for 3 * width
+    length_factor = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    print(f"{'Size':<10}{'Walls':>8}{'Path':>8}{'Passes':>8}{'Mean ms':>10}{'Max ms':>10}")
+    for width, height in SIZES:
+        target = int(width * length_factor) if length_factor else None
+        reports = []
+        for seed in SEEDS:
+            generator = DungeonGenerator(width, height, seed=seed, target_path_length=target)
+            generator.generate()
+            reports.append(generator.report)
+        times = [r['seconds'] * 1000 for r in reports]
+        print(f"{width}x{height:<6}{sum(r['walls'] for r in reports) // len(reports):>8}"
+              f"{sum(r['path_length'] for r in reports) // len(reports):>8}"
+              f"{max(r['passes'] for r in reports):>8}{sum(times) / len(times):>10.1f}{max(times):>10.1f}")
@@ -0,0 +1,156 @@
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+import importlib
+import tracemalloc
+
+import benchmark_common  # Selects the dummy SDL drivers, so it comes before pygame
+import pygame
+
+from DungeonDefense_Studio import DungeonGenerator
+
+VERSIONS = ["DungeonDefense_Studio", "TowerDefense_Studio_v2", "TowerDefense_Studio_v3"]
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARED_FILES = ["resources_TowerDefenseStudio", "achievements.json"]  # Linked or copied into the scratch directory
+SEED = 1234
+WAVES = 3  # Each wave is roughly a simulated minute; pass a larger count to reach the boss wave (5)
+DT = 1 / 60
+MAX_FRAMES = 60 * 60 * 10  # Safety cap per version: 10 simulated minutes
+
+
+def fixed_map(width, height):
+    """One grid and path shared by every version, so only the code differs between runs."""
+    return DungeonGenerator(width, height, seed=SEED).generate()
+
+
+def trap_layout(grid, path):
+    """Spike and slow traps alternating along the path, turrets on walls beside it and two gold mines."""
+    height, width = len(grid), len(grid[0])
+    layout = [('spike' if i % 2 == 0 else 'slow', x, y) for i, (x, y) in enumerate(path[3:-3:6])]
+    turrets = []
+    for x, y in path[2:-2:4]:
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and grid[ny][nx] == 0 and (nx, ny) not in turrets:
+                turrets.append((nx, ny))
+                break
+    layout += [('turret', x, y) for x, y in turrets]
+    path_cells = set(path)
+    floor = [(x, y) for y in range(height) for x in range(width) if grid[y][x] == 1 and (x, y) not in path_cells]
+    layout += [('gold_mine', x, y) for x, y in floor[:2]]
+    return layout
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+
+def count_new_blocks(before, after):
+    """Memory blocks allocated between two snapshots and still alive at the second, summed over the source
+    lines that grew. Temporaries freed within the frame show up in the peak KB column instead."""
+    return sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+
+
+def run_version(module, grid, path, layout, waves, trace_allocations):
+    """Drives the scripted scenario through Game.update and Game.draw at a fixed dt, one frame at a time."""
+    random.seed(SEED)
+    module.SAVE_GENERATED_MAPS = False
+    game = module.Game()
+    if hasattr(game, 'map_supply'): game.map_supply.close()  # No background map generation during timing
+    game.reset_game()
+    game.grid, game.path_list, game.path_set = [row[:] for row in grid], list(path), set(path)
+    game.money = 10 ** 9
+    for trap_type, x, y in layout:
+        game.selected_trap_type = trap_type
+        game.place_trap(x, y)
+    game.selected_trap_type = None
+    game.money, game.lives = 10 ** 6, 10 ** 9  # Nobody goes broke or loses, so every version plays all waves
+    game.set_state("playing")
+    random.seed(SEED)
+
+    frame_ms, peak_kb, new_blocks, peak_sprites, peak_enemies = [], [], [], 0, 0
+    before = tracemalloc.take_snapshot() if trace_allocations else None
+    while len(frame_ms) < MAX_FRAMES and game.game_state == "playing":
+        if not game.wave_in_progress:
+            if game.wave >= waves: break
+            game.start_wave()
+        pygame.event.pump()
+        if trace_allocations:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        game.update(DT)
+        game.draw()
+        frame_ms.append((time.perf_counter() - start) * 1000)
+        if trace_allocations:
+            peak_kb.append((tracemalloc.get_traced_memory()[1] - base) / 1024)
+            after = tracemalloc.take_snapshot()  # Also the starting point of the next frame
+            new_blocks.append(count_new_blocks(before, after))
+            before = after
+        sprites = len(game.enemies) + len(game.projectiles) + len(game.particles) + len(game.floating_texts)
+        peak_sprites, peak_enemies = max(peak_sprites, sprites + len(game.traps)), max(peak_enemies, len(game.enemies))
+    return {'frames': len(frame_ms), 'frame_ms': frame_ms, 'peak_kb': peak_kb, 'new_blocks': new_blocks,
+            'traps': len(game.traps), 'peak_sprites': peak_sprites, 'peak_enemies': peak_enemies, 'waves': game.wave}
+
+
+def benchmark(module, grid, path, layout, waves):
+    timing = run_version(module, grid, path, layout, waves, trace_allocations=False)
+    # Peak memory and new blocks per frame are measured in a second, identical run: tracemalloc slows every
+    # allocation down and the per-frame snapshots take far longer than the frames themselves
+    tracemalloc.start()
+    try:
+        traced = run_version(module, grid, path, layout, waves, trace_allocations=True)
+    finally:
+        tracemalloc.stop()
+    times = sorted(timing['frame_ms'])
+    timing.update(mean=sum(times) / len(times), p95=percentile(times, 0.95), p99=percentile(times, 0.99),
+                  peak_kb=sum(traced['peak_kb']) / len(traced['peak_kb']),
+                  new_blocks=sum(traced['new_blocks']) / len(traced['new_blocks']))
+    return timing
+
+
+def prepare_scratch_dir(scratch):
+    """Stats, achievements and map caches are written here instead of next to the real game files."""
+    for name in SHARED_FILES:
+        source = os.path.join(REPO_DIR, name)
+        if not os.path.exists(source): continue
+        if os.path.isdir(source):
+            try:
+                os.symlink(source, os.path.join(scratch, name))
+            except OSError:
+                shutil.copytree(source, os.path.join(scratch, name))
+        else:
+            shutil.copy(source, scratch)
+
+
+if __name__ == "__main__":
+    # Arguments: number of waves (default 3), then optionally the module names to compare
+    waves = int(sys.argv[1]) if len(sys.argv) > 1 else WAVES
+    names = sys.argv[2:] or VERSIONS
+    modules = [importlib.import_module(name) for name in names]
+    sizes = {(m.GRID_WIDTH, m.GRID_HEIGHT) for m in modules}
+    if len(sizes) != 1: sys.exit(f"Versions disagree on the grid size: {sizes}")
+    grid, path = fixed_map(*sizes.pop())
+    layout = trap_layout(grid, path)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        prepare_scratch_dir(scratch)
+        os.chdir(scratch)
+        try:
+            for name, module in zip(names, modules):
+                print(f"Running {name}...", file=sys.stderr)
+                results[name] = benchmark(module, grid, path, layout, waves)
+        finally:
+            os.chdir(REPO_DIR)
+            pygame.quit()
+
+    print(f"\n{len(layout)} traps, {waves} waves, path of {len(path)} cells, seed {SEED}")
+    print(f"{'Version':<26}{'Frames':>8}{'Mean ms':>9}{'p95 ms':>8}{'p99 ms':>8}"
+          f"{'Peak sprites':>14}{'Peak enemies':>14}{'Peak KB/frame':>16}{'New blocks/frame':>18}")
+    for name, r in results.items():
+        print(f"{name:<26}{r['frames']:>8}{r['mean']:>9.2f}{r['p95']:>8.2f}{r['p99']:>8.2f}"
+              f"{r['peak_sprites']:>14}{r['peak_enemies']:>14}{r['peak_kb']:>16.1f}{r['new_blocks']:>18.1f}")
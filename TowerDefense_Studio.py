@@ -3,6 +3,10 @@ import math
 import random
 import json
 import os
+import heapq
+import hashlib
+import struct
+from collections import OrderedDict
 
 # --- Initialization ---
 pygame.init()
@@ -34,24 +38,137 @@ FONT_GAME_OVER = pygame.font.SysFont("Arial", 64, bold=True)
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Procedural Tower Defense (With Maps & Research)")
 
-# --- Map Definitions ---
-MAPS = [
-    {
-        "name": "The Classic",
-        "path": [(-50, 150), (150, 150), (150, 400), (400, 400), (400, 250), (650, 250),
-                 (650, 550), (900, 550), (900, 100), (SCREEN_WIDTH - GAME_PANEL_WIDTH + 50, 100)]
-    },
-    {
-        "name": "Serpentine",
-        "path": [(-50, 100), (850, 100), (850, 300), (100, 300), (100, 500), (850, 500),
-                 (850, 700), (100, 700), (100, SCREEN_HEIGHT + 50)]
-    },
-    {
-        "name": "Crossroads",
-        "path": [(-50, 384), (250, 384), (250, 150), (750, 150), (750, 650), (250, 650),
-                 (250, 484), (900, 484), (900, 250), (SCREEN_WIDTH - GAME_PANEL_WIDTH + 50, 250)]
-    }
-]
+# --- Map Packs ---
+# Maps are files in MAP_DIR (JSON or the compact binary .tdmap format), next to this script. The background,
+# placement mask and segment lengths derived from a map are cached in MAP_CACHE_DIR under a hash of the file's contents.
+MAP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps_TowerDefenseStudio")
+MAP_CACHE_DIR = os.path.join(MAP_DIR, "cache")
+MAP_CACHE_VERSION = 3  # Bump when render_map_background, build_placement_mask or the nav fields change
+PLAY_AREA_SIZE = (SCREEN_WIDTH - GAME_PANEL_WIDTH, SCREEN_HEIGHT)
+
+
+def load_json_map(raw):
+    data = json.loads(raw)
+    return data["name"], [tuple(p) for p in data["path"]]
+
+
+def load_binary_map(raw):
+    """b'TDM1', uint8 name length, UTF-8 name, uint16 point count, then little-endian int16 (x, y) pairs."""
+    if raw[:4] != b"TDM1": raise ValueError("Not a TDM1 map file")
+    name_len = raw[4]
+    (count,) = struct.unpack_from("<H", raw, 5 + name_len)
+    coords = struct.unpack_from(f"<{count * 2}h", raw, 7 + name_len)
+    return raw[5:5 + name_len].decode("utf-8"), list(zip(coords[::2], coords[1::2]))
+
+
+def save_binary_map(filename, name, path):
+    name_bytes = name.encode("utf-8")
+    with open(filename, "wb") as f:
+        f.write(b"TDM1" + struct.pack("<B", len(name_bytes)) + name_bytes +
+                struct.pack(f"<H{len(path) * 2}h", len(path), *[c for p in path for c in p]))
+
+
+MAP_LOADERS = {".json": load_json_map, ".tdmap": load_binary_map}
+
+
+def render_map_background(path):
+    background = pygame.Surface(PLAY_AREA_SIZE)
+    for y in range(SCREEN_HEIGHT):
+        r = y / SCREEN_HEIGHT;
+        color = (int(COLOR_GRASS_TOP[0] * (1 - r) + COLOR_GRASS_BOTTOM[0] * r),
+                 int(COLOR_GRASS_TOP[1] * (1 - r) + COLOR_GRASS_BOTTOM[1] * r),
+                 int(COLOR_GRASS_TOP[2] * (1 - r) + COLOR_GRASS_BOTTOM[2] * r))
+        pygame.draw.line(background, color, (0, y), (PLAY_AREA_SIZE[0], y))
+    for i in range(len(path) - 1): pygame.draw.line(background, COLOR_PATH, path[i], path[i + 1], 50)
+    for p in path: pygame.draw.circle(background, COLOR_PATH, p, 25)
+    return background
+
+
+def build_placement_mask(path):
+    """Set bits are buildable; each path segment's bounding box, grown by 25px, is cleared."""
+    mask = pygame.Mask(PLAY_AREA_SIZE, fill=True)
+    for p1, p2 in zip(path, path[1:]):
+        rect = pygame.Rect(min(p1[0], p2[0]) - 25, min(p1[1], p2[1]) - 25, abs(p1[0] - p2[0]) + 50,
+                           abs(p1[1] - p2[1]) + 50)
+        mask.erase(pygame.Mask(rect.size, fill=True), rect.topleft)
+    return mask
+
+
+class MapEntry:
+    """One map file. The name and path are parsed on first access, navigation data on first use,
+    and the background and placement mask only when a game is started on the map."""
+
+    def __init__(self, filename):
+        self.filename, self._name, self._path, self._nav = filename, None, None, None
+        self.background, self.placement_mask = None, None
+
+    def _load(self):
+        with open(self.filename, "rb") as f: raw = f.read()
+        self._name, self._path = MAP_LOADERS[os.path.splitext(self.filename)[1]](raw)
+        key = raw + f"|{MAP_CACHE_VERSION}|{PLAY_AREA_SIZE}".encode()
+        self.cache_prefix = os.path.join(MAP_CACHE_DIR, hashlib.sha1(key).hexdigest()[:16])
+
+    @property
+    def name(self):
+        if self._name is None: self._load()
+        return self._name
+
+    @property
+    def path(self):
+        if self._path is None: self._load()
+        return self._path
+
+    @property
+    def nav(self):
+        """{"segment_lengths": [...], "path_length": float}, read from or written to the cache.
+        segment_lengths[i] is the distance from path[i] to path[i + 1]."""
+        if self._nav is None:
+            path, nav_file = self.path, self.cache_prefix + ".json"
+            if os.path.exists(nav_file):
+                with open(nav_file, 'r') as f: self._nav = json.load(f)
+            else:
+                lengths = [distance(p1, p2) for p1, p2 in zip(path, path[1:])]
+                self._nav = {"segment_lengths": lengths, "path_length": sum(lengths)}
+                os.makedirs(MAP_CACHE_DIR, exist_ok=True)
+                with open(nav_file, 'w') as f: json.dump(self._nav, f)
+        return self._nav
+
+    def prepare(self):
+        """Loads the background and placement mask, rendering and caching them if this map changed."""
+        if self.background is not None: return self
+        path, bg_file, mask_file = self.path, self.cache_prefix + "_background.png", self.cache_prefix + "_mask.png"
+        if os.path.exists(bg_file) and os.path.exists(mask_file):
+            self.background = pygame.image.load(bg_file).convert()
+            self.placement_mask = pygame.mask.from_surface(pygame.image.load(mask_file))
+        else:
+            self.background, self.placement_mask = render_map_background(path), build_placement_mask(path)
+            os.makedirs(MAP_CACHE_DIR, exist_ok=True)
+            pygame.image.save(self.background, bg_file)
+            pygame.image.save(self.placement_mask.to_surface(setcolor=(255, 255, 255, 255),
+                                                             unsetcolor=(0, 0, 0, 0)), mask_file)
+        return self
+
+
+class MapPack:
+    """All map files in a directory, in file-name order. Only the directory listing happens up front.
+    A missing directory gives an empty pack."""
+
+    def __init__(self, directory):
+        files = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+        self.entries = [MapEntry(os.path.join(directory, f)) for f in files if os.path.splitext(f)[1] in MAP_LOADERS]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+
+MAPS = MapPack(MAP_DIR)
+
 
 # --- Save File and Upgrade Management ---
 player_upgrades = {}
@@ -84,6 +201,102 @@ def distance(p1, p2): return math.sqrt((p2[0] - p1[0]) ** 2 + (p2[1] - p1[1]) **
 
 
 # --- Classes ---
+class EffectSpriteCache:
+    """LRU cache of pre-rendered opaque circles keyed on (radius, color); fading is applied at blit time with
+    the surface alpha, so a fading pulse reuses one sprite. Bounded by total pixel memory."""
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.sprites, self.max_bytes, self.used_bytes = OrderedDict(), max_bytes, 0
+        self.hits = self.misses = 0
+
+    def get(self, radius, color, alpha=255):
+        key = (max(1, int(round(radius))), tuple(int(c) for c in color))
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            sprite.set_alpha(int(alpha))
+            return sprite
+        self.misses += 1
+        r = key[0]
+        sprite = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, key[1], (r, r), r)
+        sprite.set_alpha(int(alpha))
+        self.sprites[key] = sprite
+        self.used_bytes += r * r * 16
+        while self.used_bytes > self.max_bytes and len(self.sprites) > 1:
+            _, old = self.sprites.popitem(last=False)
+            self.used_bytes -= old.get_width() * old.get_height() * 4
+        return sprite
+
+
+effect_sprites = EffectSpriteCache()
+
+
+class RangeIndicatorRenderer:
+    """Caches one tightly sized translucent circle per (range, color) and blits it centred on a position."""
+
+    def __init__(self):
+        self.surfaces = {}
+
+    def draw(self, surface, pos, radius, color):
+        rs = self.surfaces.get((radius, color))
+        if rs is None:
+            rs = self.surfaces[(radius, color)] = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(rs, color, (radius, radius), radius)
+        surface.blit(rs, (pos[0] - radius, pos[1] - radius))
+
+
+range_indicators = RangeIndicatorRenderer()
+
+
+class PlacementGhostCache:
+    """One translucent base square and level-1 range per tower type, built the first time that type is placed."""
+
+    def __init__(self):
+        self.ghosts = {}
+
+    def get(self, tower_type):
+        ghost = self.ghosts.get(tower_type)
+        if ghost is None:
+            tower = Tower((0, 0), tower_type)
+            base = pygame.Surface((40, 40), pygame.SRCALPHA)
+            base.fill((*tower.base_color, 128))
+            ghost = self.ghosts[tower_type] = (base, tower.range)
+        return ghost
+
+
+placement_ghosts = PlacementGhostCache()
+
+
+class SpatialGrid:
+    """Uniform bucket grid over live enemies, rebuilt once per frame by Game.update for all radius queries."""
+
+    def __init__(self, cell_size=64):
+        self.cell_size, self.cells = cell_size, {}
+
+    def rebuild(self, enemies):
+        cells, cs = {}, self.cell_size
+        for rank, enemy in enumerate(enemies):
+            if not enemy.is_alive: continue
+            enemy.grid_rank = rank
+            key = (int(enemy.pos[0] // cs), int(enemy.pos[1] // cs))
+            if key in cells:
+                cells[key].append(enemy)
+            else:
+                cells[key] = [enemy]
+        self.cells = cells
+
+    def query(self, pos, radius):
+        """Yields the live enemies within radius of pos."""
+        cs, cells, r2 = self.cell_size, self.cells, radius * radius
+        for cx in range(int((pos[0] - radius) // cs), int((pos[0] + radius) // cs) + 1):
+            for cy in range(int((pos[1] - radius) // cs), int((pos[1] + radius) // cs) + 1):
+                for enemy in cells.get((cx, cy), ()):
+                    dx, dy = enemy.pos[0] - pos[0], enemy.pos[1] - pos[1]
+                    if enemy.is_alive and dx * dx + dy * dy <= r2: yield enemy
+
+
 class Effect:
     def __init__(self, pos, shape, color, size, duration, vel=None, size_decay=0, alpha_decay=0):
         self.pos, self.shape, self.color, self.size, self.duration = list(pos), shape, list(color), size, duration
@@ -101,9 +314,8 @@ class Effect:
     def draw(self, surface):
         if self.size <= 0: return
         if self.shape == 'circle':
-            ts = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(ts, (*self.color, self.alpha), (self.size, self.size), self.size)
-            surface.blit(ts, (self.pos[0] - self.size, self.pos[1] - self.size))
+            ts = effect_sprites.get(self.size, self.color, self.alpha)
+            surface.blit(ts, (self.pos[0] - ts.get_width() / 2, self.pos[1] - ts.get_height() / 2))
 
 
 class Enemy:
@@ -188,21 +400,22 @@ class Tower:
     def upgrade(self):
         if game and self.level < 3 and game.player_money >= self.upgrade_cost: game.player_money -= self.upgrade_cost; self.level += 1; self.set_stats()
 
-    def find_target(self, enemies):
+    def find_target(self, enemy_grid):
         if self.target and (
                 not self.target.is_alive or distance(self.pos, self.target.pos) > self.range): self.target = None
         if not self.target:
-            for enemy in enemies:
-                if enemy.is_alive and distance(self.pos, enemy.pos) <= self.range: self.target = enemy; break
+            # Earliest spawned enemy in range, matching the old first-in-list scan
+            self.target = min(enemy_grid.query(self.pos, self.range), key=lambda e: e.grid_rank, default=None)
 
-    def update(self, enemies, projectiles, effects):
+    def update(self, enemy_grid, projectiles, effects):
         self.cooldown_timer = max(0, self.cooldown_timer - 1);
-        self.find_target(enemies)
-        if self.target and self.cooldown_timer == 0: self.cooldown_timer = self.cooldown; self.fire(projectiles,
+        self.find_target(enemy_grid)
+        if self.target and self.cooldown_timer == 0: self.cooldown_timer = self.cooldown; self.fire(enemy_grid,
+                                                                                                    projectiles,
                                                                                                     effects)
 
     # --- DEBUGGED ---
-    def fire(self, projectiles, effects):
+    def fire(self, enemy_grid, projectiles, effects):
         if self.type == "gatling":
             projectiles.append(Projectile(self.pos, self.target, self.damage, 5, (255, 255, 0)))
             # The multi-assignment was split into two lines to fix the UnboundLocalError
@@ -214,16 +427,12 @@ class Tower:
                 Projectile(self.pos, self.target, self.damage, 3, (0, 0, 0), splash_radius=self.splash_radius))
         elif self.type == "slowing":
             effects.append(Effect(self.pos, 'circle', (150, 180, 255), self.range, 30, alpha_decay=8.5))
-            for enemy in game.enemies:
-                if enemy.is_alive and distance(self.pos, enemy.pos) <= self.range: enemy.apply_effect("slow",
-                                                                                                      self.slow_duration,
-                                                                                                      self.slow_factor)
+            for enemy in enemy_grid.query(self.pos, self.range): enemy.apply_effect("slow", self.slow_duration,
+                                                                                    self.slow_factor)
 
     def draw(self, surface):
         if game and game.selected_tower is self:
-            rs = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA);
-            pygame.draw.circle(rs, COLOR_RANGE_CIRCLE, self.pos, self.range);
-            surface.blit(rs, (0, 0))
+            range_indicators.draw(surface, self.pos, self.range, COLOR_RANGE_CIRCLE)
         if self.type == "slowing":
             pts = [(self.pos[0] + 20 * math.cos(math.pi / 180 * (60 * i - 30)),
                     self.pos[1] + 20 * math.sin(math.pi / 180 * (60 * i - 30))) for i in range(6)]
@@ -252,15 +461,15 @@ class Projectile:
             start_pos), target, damage, speed, color, splash_radius
         self.is_active = True
 
-    def update(self, enemies, effects):
+    def update(self, enemy_grid, effects):
         if not self.is_active or not self.target.is_alive: self.is_active = False; return
         target_pos = self.target.pos
-        if distance(self.pos, target_pos) < self.speed: self.hit(enemies, effects); return
+        if distance(self.pos, target_pos) < self.speed: self.hit(enemy_grid, effects); return
         dir_x, dir_y = target_pos[0] - self.pos[0], target_pos[1] - self.pos[1]
         norm = math.sqrt(dir_x ** 2 + dir_y ** 2)
         if norm > 0: self.pos[0] += dir_x / norm * self.speed; self.pos[1] += dir_y / norm * self.speed
 
-    def hit(self, enemies, effects):
+    def hit(self, enemy_grid, effects):
         self.is_active = False;
         self.target.take_damage(self.damage)
         if self.splash_radius > 0:
@@ -270,10 +479,8 @@ class Projectile:
                     [(255, 100, 0), (255, 200, 50), (200, 50, 0)])
                 effects.append(
                     Effect(self.target.pos, 'circle', color, random.randint(3, 8), 20, vel=vel, size_decay=0.3))
-            for enemy in enemies:
-                if enemy is not self.target and enemy.is_alive and distance(self.target.pos,
-                                                                            enemy.pos) <= self.splash_radius: enemy.take_damage(
-                    self.damage * 0.5)
+            for enemy in list(enemy_grid.query(self.target.pos, self.splash_radius)):
+                if enemy is not self.target: enemy.take_damage(self.damage * 0.5)
 
     def draw(self, surface):
         if self.is_active: pygame.draw.circle(surface, self.color, (int(self.pos[0]), int(self.pos[1])), 4)
@@ -308,11 +515,56 @@ wave_definitions = [[("grunt", 10, 60)], [("grunt", 15, 50)], [("runner", 5, 80)
                     [("tank", 12, 120), ("runner", 20, 30), ("grunt", 20, 30)]]
 
 
+def endless_waves(seed):
+    """Yields procedurally generated wave compositions forever; wave n only depends on (seed, n)."""
+    wave_number = len(wave_definitions)
+    while True:
+        wave_number += 1
+        rng = random.Random(seed * 1000003 + wave_number)
+        weights = {"grunt": max(1, 10 - wave_number // 5), "runner": 4 + wave_number // 10, "tank": 1 + wave_number // 4}
+        budget = 30 + wave_number * 4
+        wave = []
+        for e_type in rng.choices(list(weights), weights=list(weights.values()), k=rng.randint(1, 3)):
+            count = max(1, int(budget / len(weights) * rng.uniform(0.6, 1.2)) // (5 if e_type == "tank" else 1))
+            delay = max(8, int({"grunt": 40, "runner": 30, "tank": 150}[e_type] * rng.uniform(0.6, 1.0)
+                                - wave_number // 2))
+            wave.append((e_type, count, delay))
+        yield wave
+
+
+class WaveScheduler:
+    """Releases every spawn that is due, in time order. Each (type, count, delay) group is one heap entry
+    that re-arms itself after each spawn, so memory stays O(groups) no matter how large the wave is."""
+
+    def __init__(self):
+        self.heap, self.timer = [], 0
+
+    def __bool__(self):
+        return bool(self.heap)
+
+    def load(self, wave_data):
+        self.heap, self.timer = [], 0
+        for seq, (e_type, count, delay) in enumerate(wave_data):
+            if count > 0: heapq.heappush(self.heap, (0, seq, e_type, count, delay))
+
+    def release(self):
+        self.timer += 1
+        while self.heap and self.heap[0][0] < self.timer:
+            spawn_time, seq, e_type, remaining, delay = heapq.heappop(self.heap)
+            if remaining > 1: heapq.heappush(self.heap, (spawn_time + delay, seq, e_type, remaining - 1, delay))
+            yield e_type
+
+
 class Game:
-    def __init__(self, map_data):
-        self.enemy_path = map_data['path']
+    def __init__(self, map_data, endless_seed=None):
+        map_data.prepare()
+        self.enemy_path, self.background, self.placement_mask = map_data.path, map_data.background, map_data.placement_mask
         self.towers, self.enemies, self.projectiles, self.effects = [], [], [], []
-        self.wave_spawn_list, self.wave_spawn_timer = [], 0
+        self.enemy_grid, self.spawn_scheduler = SpatialGrid(), WaveScheduler()
+        if endless_seed is None:
+            self.wave_source, self.total_waves = iter(wave_definitions), len(wave_definitions)
+        else:
+            self.wave_source, self.total_waves = endless_waves(endless_seed), None
         self.time_between_waves, self.wave_cooldown = 900, 900
         self.player_health = 20 + player_upgrades["upgrades"]["starting_health"]
         self.player_money = 650 + (player_upgrades["upgrades"]["starting_money"] * 50)
@@ -343,16 +595,17 @@ class Game:
     def upgrade_selected_tower(self):
         if self.selected_tower: self.selected_tower.upgrade()
 
+    def has_more_waves(self):
+        return self.total_waves is None or self.current_wave < self.total_waves
+
     def start_next_wave(self):
-        if not self.wave_spawn_list and self.current_wave < len(wave_definitions):
+        if not self.spawn_scheduler and self.has_more_waves():
             if self.wave_cooldown < self.time_between_waves: self.player_money += int(
                 ((self.time_between_waves - self.wave_cooldown) / self.time_between_waves) * (
                             50 + self.current_wave * 5))
             self.current_wave += 1
-            wave_data = wave_definitions[self.current_wave - 1]
-            self.wave_spawn_list = [(e_type, i * delay) for e_type, count, delay in wave_data for i in range(count)]
-            self.wave_spawn_list.sort(key=lambda x: x[1]);
-            self.wave_spawn_timer, self.wave_cooldown = 0, 0
+            self.spawn_scheduler.load(next(self.wave_source))
+            self.wave_cooldown = 0
             self.start_wave_button.text = "Wave in Progress"
 
     def handle_events(self, events):
@@ -369,10 +622,8 @@ class Game:
                         self.selected_tower = next((t for t in self.towers if distance(mouse_pos, t.pos) < 20), None)
 
     def place_tower(self, pos):
-        path_rects = [pygame.Rect(min(p1[0], p2[0]) - 25, min(p1[1], p2[1]) - 25, abs(p1[0] - p2[0]) + 50,
-                                  abs(p1[1] - p2[1]) + 50) for i in range(len(self.enemy_path) - 1) for p1, p2 in
-                      [(self.enemy_path[i], self.enemy_path[i + 1])]]
-        if any(r.collidepoint(pos) for r in path_rects) or any(distance(pos, t.pos) < 40 for t in self.towers): return
+        if not self.placement_mask.get_rect().collidepoint(pos) or not self.placement_mask.get_at(pos): return
+        if any(distance(pos, t.pos) < 40 for t in self.towers): return
         new_tower = Tower(pos, self.placing_tower_type)
         if self.player_money >= new_tower.cost: self.player_money -= new_tower.cost; self.towers.append(
             new_tower); self.placing_tower_type = None
@@ -381,37 +632,27 @@ class Game:
         global game_state
         if self.player_health <= 0:
             game_state = "GAME_OVER"; return
-        elif not self.wave_spawn_list and not self.enemies and self.current_wave >= len(wave_definitions):
+        elif not self.spawn_scheduler and not self.enemies and not self.has_more_waves():
             game_state = "GAME_OVER"; return
-        for t in self.towers: t.update(self.enemies, self.projectiles, self.effects)
-        for p in self.projectiles: p.update(self.enemies, self.effects)
+        self.enemy_grid.rebuild(self.enemies)
+        for t in self.towers: t.update(self.enemy_grid, self.projectiles, self.effects)
+        for p in self.projectiles: p.update(self.enemy_grid, self.effects)
         for e in self.effects: e.update()
         for e in self.enemies: e.update()
         self.enemies[:] = [e for e in self.enemies if e.is_alive];
         self.projectiles[:] = [p for p in self.projectiles if p.is_active];
         self.effects[:] = [e for e in self.effects if e.is_active]
-        if self.wave_spawn_list:
-            self.wave_spawn_timer += 1
-            if self.wave_spawn_list and self.wave_spawn_list[0][1] < self.wave_spawn_timer:
-                e_type, _ = self.wave_spawn_list.pop(0);
-                self.enemies.append(Enemy(e_type, self.enemy_path[0]))
+        if self.spawn_scheduler:
+            for e_type in self.spawn_scheduler.release(): self.enemies.append(Enemy(e_type, self.enemy_path[0]))
         elif not self.enemies:
             if self.wave_cooldown < self.time_between_waves: self.wave_cooldown += 1
-            if self.wave_cooldown >= self.time_between_waves and self.current_wave < len(wave_definitions):
+            if self.wave_cooldown >= self.time_between_waves and self.has_more_waves():
                 self.start_wave_button.text = f"Start Wave {self.current_wave + 1}"
-            elif self.current_wave >= len(wave_definitions):
+            elif not self.has_more_waves():
                 self.start_wave_button.text = "YOU WIN!"
 
     def draw_map(self, surface):
-        for y in range(SCREEN_HEIGHT):
-            r = y / SCREEN_HEIGHT;
-            color = (int(COLOR_GRASS_TOP[0] * (1 - r) + COLOR_GRASS_BOTTOM[0] * r),
-                     int(COLOR_GRASS_TOP[1] * (1 - r) + COLOR_GRASS_BOTTOM[1] * r),
-                     int(COLOR_GRASS_TOP[2] * (1 - r) + COLOR_GRASS_BOTTOM[2] * r))
-            pygame.draw.line(surface, color, (0, y), (SCREEN_WIDTH - GAME_PANEL_WIDTH, y))
-        for i in range(len(self.enemy_path) - 1): pygame.draw.line(surface, COLOR_PATH, self.enemy_path[i],
-                                                                   self.enemy_path[i + 1], 50)
-        for p in self.enemy_path: pygame.draw.circle(surface, COLOR_PATH, p, 25)
+        surface.blit(self.background, (0, 0))
 
     def draw(self, surface):
         self.draw_map(surface)
@@ -425,21 +666,17 @@ class Game:
     def draw_placement_preview(self, surface):
         mouse_pos = pygame.mouse.get_pos()
         if mouse_pos[0] > SCREEN_WIDTH - GAME_PANEL_WIDTH: return
-        temp_tower = Tower(mouse_pos, self.placing_tower_type)
-        rs = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA);
-        pygame.draw.circle(rs, (*COLOR_RANGE_CIRCLE[:3], 100), mouse_pos, temp_tower.range);
-        surface.blit(rs, (0, 0))
-        bs = pygame.Surface((40, 40), pygame.SRCALPHA);
-        bs.fill((*temp_tower.base_color, 128));
-        surface.blit(bs, (mouse_pos[0] - 20, mouse_pos[1] - 20))
+        base, tower_range = placement_ghosts.get(self.placing_tower_type)
+        range_indicators.draw(surface, mouse_pos, tower_range, (*COLOR_RANGE_CIRCLE[:3], 100))
+        surface.blit(base, (mouse_pos[0] - 20, mouse_pos[1] - 20))
 
     def draw_ui(self, surface):
         pr = (SCREEN_WIDTH - GAME_PANEL_WIDTH, 0, GAME_PANEL_WIDTH, SCREEN_HEIGHT);
         pygame.draw.rect(surface, COLOR_PANEL, pr)
         surface.blit(FONT_UI.render(f"Health: {self.player_health}", True, COLOR_TEXT), (pr[0] + 20, 20))
         surface.blit(FONT_UI.render(f"Money: ${self.player_money}", True, COLOR_TEXT), (pr[0] + 20, 50))
-        surface.blit(FONT_UI.render(f"Wave: {self.current_wave}/{len(wave_definitions)}", True, COLOR_TEXT),
-                     (pr[0] + 20, 80))
+        wave_label = f"{self.current_wave}/{self.total_waves}" if self.total_waves else f"{self.current_wave} (Endless)"
+        surface.blit(FONT_UI.render(f"Wave: {wave_label}", True, COLOR_TEXT), (pr[0] + 20, 80))
         surface.blit(FONT_TITLE.render("Build Towers", True, COLOR_TEXT), (pr[0] + 20, 130))
         for b in self.buttons: b.draw(surface)
         if self.selected_tower:
@@ -453,7 +690,7 @@ class Game:
             self.upgrade_button.text = f"Upgrade (${st.upgrade_cost})" if st.level < 3 else "Max Level"
         else:
             self.upgrade_button.text = "Upgrade"
-        if not self.wave_spawn_list and not self.enemies and self.current_wave < len(wave_definitions):
+        if not self.spawn_scheduler and not self.enemies and self.has_more_waves():
             bonus = int(((self.time_between_waves - self.wave_cooldown) / self.time_between_waves) * (
                         50 + self.current_wave * 5))
             if bonus > 0: surface.blit(FONT_UI.render(f"Rush Bonus: ${bonus}", True, (255, 215, 0)),
@@ -463,7 +700,7 @@ class Game:
 # --- Research Menu Class ---
 class ResearchMenu:
     def __init__(self):
-        self.buttons, self.selected_map_index = [], 0
+        self.buttons, self.selected_map_index, self.endless_mode = [], 0, False
         self.setup_menu()
 
     def get_upgrade_cost(self, name):
@@ -492,15 +729,25 @@ class ResearchMenu:
                                    lambda: player_upgrades["research_points"] >= self.get_upgrade_cost("cannon_cost")))
         self.buttons.append(Button((800, 650, 50, 50), "<", self.prev_map));
         self.buttons.append(Button((1030, 650, 50, 50), ">", self.next_map))
+        self.endless_button = Button((865, 650, 150, 50), "Endless: Off", self.toggle_endless)
+        self.buttons.append(self.endless_button)
+
+    def toggle_endless(self):
+        self.endless_mode = not self.endless_mode
+        self.endless_button.text = f"Endless: {'On' if self.endless_mode else 'Off'}"
 
     def start_game(self):
         global game, game_state
-        game, game_state = Game(MAPS[self.selected_map_index]), "IN_GAME"
+        if not MAPS: return
+        endless_seed = random.randrange(1 << 30) if self.endless_mode else None
+        game, game_state = Game(MAPS[self.selected_map_index], endless_seed), "IN_GAME"
 
     def prev_map(self):
+        if not MAPS: return
         self.selected_map_index = (self.selected_map_index - 1 + len(MAPS)) % len(MAPS)
 
     def next_map(self):
+        if not MAPS: return
         self.selected_map_index = (self.selected_map_index + 1) % len(MAPS)
 
     def handle_events(self, events):
@@ -536,10 +783,17 @@ class ResearchMenu:
         preview_rect = pygame.Rect(700, 200, 480, 400)
         pygame.draw.rect(surface, (10, 15, 20), preview_rect);
         pygame.draw.rect(surface, COLOR_TEXT, preview_rect, 2)
+        if not MAPS:
+            empty_surf = FONT_UI.render(f"No maps in {os.path.basename(MAP_DIR)}", True, COLOR_TEXT)
+            surface.blit(empty_surf, (preview_rect.centerx - empty_surf.get_width() / 2, preview_rect.centery))
+            return
         map_data = MAPS[self.selected_map_index]
-        name_surf = FONT_TITLE.render(map_data['name'], True, COLOR_TEXT);
+        name_surf = FONT_TITLE.render(map_data.name, True, COLOR_TEXT);
         surface.blit(name_surf, (preview_rect.centerx - name_surf.get_width() / 2, preview_rect.top - 50))
-        path = map_data['path']
+        length_surf = FONT_UI.render(f"Map {self.selected_map_index + 1}/{len(MAPS)} - Path length: "
+                                     f"{int(map_data.nav['path_length'])}px", True, COLOR_TEXT)
+        surface.blit(length_surf, (preview_rect.centerx - length_surf.get_width() / 2, preview_rect.bottom + 5))
+        path = map_data.path
         min_x = min(p[0] for p in path if p[0] > 0);
         max_x = max(p[0] for p in path if p[0] < SCREEN_WIDTH - GAME_PANEL_WIDTH)
         min_y = min(p[1] for p in path);
@@ -571,7 +825,7 @@ if __name__ == "__main__":
         elif game_state == "GAME_OVER":
             if game:
                 final_wave = game.current_wave;
-                earned_rp = final_wave * 10 if final_wave >= len(wave_definitions) else (final_wave - 1) * 10
+                earned_rp = final_wave * 10 if not game.has_more_waves() else (final_wave - 1) * 10
                 player_upgrades["research_points"] += max(0, earned_rp);
                 save_upgrades();
                 game = None
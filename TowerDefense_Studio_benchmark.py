@@ -0,0 +1,68 @@
+import sys
+import time
+import random
+
+from benchmark_common import spread_along_path
+import TowerDefense_Studio as td
+
+TOWER_COUNT = 60
+ENEMY_COUNT = 3000
+FRAMES = 120
+
+
+class LinearIndex:
+    """Same interface as SpatialGrid but scans every enemy, i.e. the pre-grid behaviour, for comparison."""
+
+    def rebuild(self, enemies):
+        self.enemies = enemies
+        for rank, enemy in enumerate(enemies): enemy.grid_rank = rank
+
+    def query(self, pos, radius):
+        for enemy in self.enemies:
+            if enemy.is_alive and td.distance(pos, enemy.pos) <= radius: yield enemy
+
+
+def build_scene(map_data, seed=1):
+    rng = random.Random(seed)
+    td.game = game = td.Game(map_data)
+    game.player_health, game.player_money = 10 ** 9, 10 ** 9
+    # Towers: every legal placement on a 45px lattice, sampled down to TOWER_COUNT
+    spots = [(x, y) for x in range(30, td.SCREEN_WIDTH - td.GAME_PANEL_WIDTH - 20, 45)
+             for y in range(30, td.SCREEN_HEIGHT - 20, 45)]
+    rng.shuffle(spots)
+    tower_types = ["gatling", "cannon", "slowing"]
+    for pos in spots:
+        if len(game.towers) >= TOWER_COUNT: break
+        game.placing_tower_type = tower_types[len(game.towers) % 3]
+        game.place_tower(pos)
+    # Enemies: spread uniformly along the path (segments weighted by length), with enough health to survive the run
+    path = game.enemy_path
+    for i, pos in spread_along_path(path, ENEMY_COUNT, rng, map_data.nav["segment_lengths"]):
+        enemy = td.Enemy(rng.choice(["grunt", "runner", "tank"]), pos)
+        enemy.path_index, enemy.target_pos = i + 1, path[i + 1]
+        enemy.max_health = enemy.health = 10 ** 9
+        game.enemies.append(enemy)
+    return game
+
+
+def run(map_data, index_factory):
+    random.seed(0)
+    game = build_scene(map_data)
+    game.enemy_grid = index_factory()
+    towers, enemies = len(game.towers), len(game.enemies)
+    start = time.perf_counter()
+    for _ in range(FRAMES): game.update()
+    elapsed = time.perf_counter() - start
+    return elapsed / FRAMES * 1000, towers, enemies
+
+
+if __name__ == "__main__":
+    td.player_upgrades = {"research_points": 0, "upgrades": {"starting_money": 0, "starting_health": 0,
+                                                             "gatling_damage": 0, "cannon_cost": 0}}
+    use_linear = "--linear" in sys.argv
+    print(f"{'Map':<14}{'Towers':>8}{'Enemies':>9}{'Grid ms/frame':>16}" + (f"{'Linear ms/frame':>18}" if use_linear else ""))
+    for map_data in td.MAPS:
+        grid_ms, towers, enemies = run(map_data, td.SpatialGrid)
+        line = f"{map_data.name:<14}{towers:>8}{enemies:>9}{grid_ms:>16.2f}"
+        if use_linear: line += f"{run(map_data, LinearIndex)[0]:>18.2f}"
+        print(line)
@@ -4,6 +4,8 @@ import math
 import json
 import os
 
+from map_supply import MapSupply
+
 # --- Constants ---
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
@@ -16,6 +18,8 @@ TOTAL_WAVES = 20
 BOSS_WAVE_INTERVAL = 5
 STATS_FILE = 'dungeon_stats.json'
 ACHIEVEMENTS_FILE = 'achievements.json'
+MAP_CACHE_FILE = os.path.join('dungeon_map_cache', 'dungeon_maps_v3.json')
+SAVE_GENERATED_MAPS = True  # Keep unplayed pre-generated maps on disk for the next session
 
 # --- Colors ---
 COLOR_WALL = (50, 50, 50)
@@ -786,6 +790,9 @@ class Game:
         self.load_assets();
         self.end_screen_timer_start = 0;
         self.game_speed = 1.0  # Initialize game_speed here
+        self.map_supply = MapSupply(self.generate_map, (GRID_WIDTH, GRID_HEIGHT),
+                                    cache_file=MAP_CACHE_FILE if SAVE_GENERATED_MAPS else None)
+        self.map_supply.start()
         self.setup_ui()
 
     def load_assets(self):
@@ -795,7 +802,7 @@ class Game:
             try:
                 self.background_images.append(
                     pygame.image.load(os.path.join(resource_dir, f"background{i:02d}.png")).convert())
-            except pygame.error as e:
+            except (pygame.error, FileNotFoundError) as e:
                 print(f"Warning: Could not load background{i:02d}.png. {e}")
         for rank in ["Captain", "General", "Admiral"]:
             for armor in range(3):
@@ -803,7 +810,7 @@ class Game:
                 filename = f"{rank.lower()}{armor if armor > 0 else ''}.png"
                 try:
                     self.rank_images[key] = pygame.image.load(os.path.join(resource_dir, filename)).convert_alpha()
-                except pygame.error as e:
+                except (pygame.error, FileNotFoundError) as e:
                     print(f"Warning: Could not load {filename}. {e}");
                     self.rank_images[key] = None
         for outcome in ['victory', 'loss']:
@@ -814,7 +821,7 @@ class Game:
                     try:
                         self.end_screen_images[key] = pygame.image.load(
                             os.path.join(resource_dir, filename)).convert()
-                    except pygame.error as e:
+                    except (pygame.error, FileNotFoundError) as e:
                         print(f"Warning: Could not load {filename}. {e}");
                         self.end_screen_images[key] = None
 
@@ -855,30 +862,7 @@ class Game:
 
     def reset_game(self):
         self.current_background = random.choice(self.background_images) if self.background_images else None
-        self.path_list = []
-
-        start_point = (0, GRID_HEIGHT // 2)
-        end_point = None  # This will be determined by the grid generation
-
-        attempts = 0
-        max_attempts = 100
-        while not self.path_list:
-            # create_grid now returns two values: the grid and the end_point tuple
-            self.grid, end_point = self.create_grid()
-
-            # We now pass the specific start and end points to the pathfinder
-            self.path_list = self.find_path(start_point, end_point)
-
-            attempts += 1
-            if attempts >= max_attempts:
-                print(f"WARNING: Failed to generate a valid random path after {max_attempts} attempts.")
-                print("Generating a failsafe grid to prevent game freeze.")
-                self.grid = self.create_failsafe_grid()
-                # The failsafe grid has a known, fixed path
-                self.path_list = self.find_path((0, GRID_HEIGHT // 2), (GRID_WIDTH - 1, GRID_HEIGHT // 2))
-                if not self.path_list:
-                    raise RuntimeError("Failsafe grid generation failed. Pathfinding is critically broken.")
-                break
+        self.grid, self.path_list, _ = self.map_supply.take()
         # Shockwave cooloff set to 5 seconds
         self.path_set = set(self.path_list)
         self.enemies, self.traps, self.projectiles = pygame.sprite.Group(), pygame.sprite.Group(), pygame.sprite.Group()
@@ -901,6 +885,26 @@ class Game:
     def start_new_game(self):
         self.reset_game(); self.set_state("playing")
 
+    def generate_map(self):
+        """Builds one (grid, path, end_point) map. Runs on the MapSupply thread, so it must not touch game state."""
+        start_point = (0, GRID_HEIGHT // 2)
+        max_attempts = 100
+        for _ in range(max_attempts):
+            # create_grid returns two values: the grid and the end_point tuple
+            grid, end_point = self.create_grid()
+            # We now pass the specific start and end points to the pathfinder
+            path = self.find_path(start_point, end_point, grid)
+            if path: return grid, path, end_point
+        print(f"WARNING: Failed to generate a valid random path after {max_attempts} attempts.")
+        print("Generating a failsafe grid to prevent game freeze.")
+        grid = self.create_failsafe_grid()
+        # The failsafe grid has a known, fixed path
+        end_point = (GRID_WIDTH - 1, GRID_HEIGHT // 2)
+        path = self.find_path(start_point, end_point, grid)
+        if not path:
+            raise RuntimeError("Failsafe grid generation failed. Pathfinding is critically broken.")
+        return grid, path, end_point
+
     def end_game(self, victory):
         s = self.research.data['stats'];
         s['games_played'] += 1;
@@ -1013,7 +1017,7 @@ class Game:
             grid[GRID_HEIGHT // 2][x] = 1
         return grid
 
-    def find_path(self, start, end):
+    def find_path(self, start, end, grid):
         open_set, came_from, g, f = {start}, {}, {}, {}
         for y in range(GRID_HEIGHT):
             for x in range(GRID_WIDTH):
@@ -1036,7 +1040,7 @@ class Game:
             open_set.remove(curr)
             for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
                 neighbor = (curr[0] + dx, curr[1] + dy)
-                if 0 <= neighbor[0] < GRID_WIDTH and 0 <= neighbor[1] < GRID_HEIGHT and self.grid[neighbor[1]][
+                if 0 <= neighbor[0] < GRID_WIDTH and 0 <= neighbor[1] < GRID_HEIGHT and grid[neighbor[1]][
                     neighbor[0]] == 1:
                     tentative_g = g.get(curr, float('inf')) + 1
                     if tentative_g < g.get(neighbor, float('inf')):
@@ -1049,12 +1053,18 @@ class Game:
 
     def set_state(self, state):
         self.game_state = state
+        # Maps are only pre-generated while the menus are open
+        if state in ("playing", "paused"):
+            self.map_supply.pause()
+        else:
+            self.map_supply.resume()
 
     def show_previous_splash(self):
         self.set_state("showing_splash")
 
     def run(self):
         while self.running: dt = self.clock.tick(FPS) / 1000.0; self.handle_events(); self.update(dt); self.draw()
+        self.map_supply.close()
 
     def handle_events(self):
         mouse_pos = pygame.mouse.get_pos()
@@ -0,0 +1,23 @@
+"""Shared by the headless benchmark and batch scripts. Importing it selects SDL's dummy video and audio drivers
+(no window, no sound), so import it before pygame or any of the games."""
+import os
+import contextlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+@contextlib.contextmanager
+def quiet():
+    """Discards stdout, for games that print on every kill and wave."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def spread_along_path(path, count, rng, lengths=None):
+    """count random points on the polyline through path, as (segment index, (x, y)) pairs. Segments are picked
+    in proportion to lengths when given, otherwise uniformly, which suits evenly spaced points."""
+    for i in rng.choices(range(len(path) - 1), weights=lengths, k=count):
+        t = rng.random()
+        (x0, y0), (x1, y1) = path[i], path[i + 1]
+        yield i, (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
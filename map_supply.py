@@ -0,0 +1,71 @@
+"""Background pre-generation of dungeon maps, shared by DungeonDefense_Studio and TowerDefense_Studio_v3."""
+import os
+import json
+import queue
+import threading
+
+
+class MapSupply:
+    """Keeps a small queue of ready-to-play (grid, path, end_point) maps, filled by a background thread while
+    the menus are open, so starting a game only has to take one. Unplayed maps can be saved to cache_file on
+    close; saved maps are only reused if they match grid_size (width, height)."""
+
+    def __init__(self, generate, grid_size, size=3, cache_file=None):
+        self.generate, self.cache_file, self.grid_size = generate, cache_file, grid_size
+        self.maps = queue.Queue(maxsize=size)
+        self.stopped = threading.Event()
+        self.refilling = threading.Event()  # Cleared while a level is running, so generation never competes with it
+        self.refilling.set()
+        self.thread = threading.Thread(target=self.fill, daemon=True)
+
+    def start(self):
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, 'r') as f: saved = json.load(f)
+                for m in saved['maps']:
+                    grid, path, end_point = m['grid'], [tuple(p) for p in m['path']], tuple(m['end_point'])
+                    if (len(grid[0]), len(grid)) == tuple(self.grid_size) and not self.maps.full():
+                        self.maps.put_nowait((grid, path, end_point))
+            except (json.JSONDecodeError, KeyError, IndexError, TypeError):
+                print(f"Warning: Ignoring unreadable map cache {self.cache_file}.")
+        self.thread.start()
+
+    def fill(self):
+        while not self.stopped.is_set():
+            self.refilling.wait()
+            if self.stopped.is_set(): break
+            generated = self.generate()
+            while not self.stopped.is_set():
+                try:
+                    self.maps.put(generated, timeout=0.5); break
+                except queue.Full:
+                    pass
+
+    def take(self):
+        """Returns a pre-generated map, or generates one on the spot if the queue has run dry."""
+        try:
+            return self.maps.get_nowait()
+        except queue.Empty:
+            return self.generate()
+
+    def pause(self):
+        """Stops starting new maps; one already being generated is still finished and queued."""
+        self.refilling.clear()
+
+    def resume(self):
+        self.refilling.set()
+
+    def close(self):
+        self.stopped.set()
+        self.refilling.set()  # Wake a paused thread so it can see the stop
+        if self.thread.is_alive(): self.thread.join()  # No put can land after the queue is drained below
+        if not self.cache_file: return
+        pending = []
+        while True:
+            try:
+                grid, path, end_point = self.maps.get_nowait()
+            except queue.Empty:
+                break
+            pending.append({'grid': grid, 'path': path, 'end_point': end_point})
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        with open(self.cache_file, 'w') as f: json.dump({'maps': pending}, f)
@@ -264,113 +264,173 @@ class Player:
         return None
 
 
+class Formation:
+    """Shared (dx, dy, direction) offset of the whole swarm. Edge checks use the cached leftmost and rightmost
+    live columns, which only change when an alien dies."""
+    EDGE_MARGIN = 10
+    STEP_DOWN = 15
+
+    def __init__(self, speed, move_delay):
+        self.dx = 0
+        self.dy = 0
+        self.direction = 1
+        self.speed = speed
+        self.move_delay = move_delay
+        self.last_move_time = 0
+        self.column_x = {}  # column -> home x of its aliens
+        self.column_count = {}  # column -> live aliens in it
+        self.left_column = self.right_column = None
+
+    def add(self, alien):
+        alien.formation = self
+        self.column_x[alien.column] = alien.home_x
+        self.column_count[alien.column] = self.column_count.get(alien.column, 0) + 1
+        self._update_bounds()
+
+    def remove(self, alien):
+        self.column_count[alien.column] -= 1
+        if not self.column_count[alien.column]:
+            del self.column_count[alien.column]
+            self._update_bounds()
+
+    def _update_bounds(self):
+        if self.column_count:
+            self.left_column, self.right_column = min(self.column_count), max(self.column_count)
+        else:
+            self.left_column = self.right_column = None
+
+    def move(self, current_time, alien_width):
+        """Steps the whole swarm sideways, or down and back at an edge. Returns True when it moved down."""
+        if self.left_column is None or current_time - self.last_move_time < self.move_delay:
+            return False
+        self.last_move_time = current_time
+        left = self.dx + self.column_x[self.left_column]
+        right = self.dx + self.column_x[self.right_column] + alien_width
+        if (left <= self.EDGE_MARGIN and self.direction == -1) or \
+                (right >= WIDTH - self.EDGE_MARGIN and self.direction == 1):
+            self.dy += self.STEP_DOWN
+            self.direction *= -1
+            return True
+        self.dx += self.speed * self.direction
+        return False
+
+
 class Alien:
-    def __init__(self, x, y, alien_type=0, wave=1):
-        self.width = 40
-        self.height = 30
-        self.x = x
-        self.y = y
+    WIDTH, HEIGHT = 40, 30
+    SPRITE_PAD = 5  # The UFO dome and boss crown reach above the alien's rect
+    COLORS = [PURPLE, RED, BLUE, ORANGE]
+    DAMAGE_TINT = (255, 120, 120)
+    atlas = {}  # (type, damaged) -> sprite, filled by build_atlas
+
+    def __init__(self, x, y, alien_type=0, wave=1, column=0):
+        self.width = self.WIDTH
+        self.height = self.HEIGHT
+        self.home_x = x
+        self.home_y = y
+        self.column = column
+        self.formation = None
         self.type = alien_type
         self.wave = wave
-        self.base_speed = 2
-        self.speed = self.base_speed * (1 + wave * 0.1)
-        self.direction = 1
-        self.move_down = False
         self.shoot_timer = 0
         self.shoot_delay = random.randint(2000, 5000)
-        self.health = 1
-        self.color = [PURPLE, RED, BLUE, ORANGE][alien_type % 4]
+        self.health = self.max_health = 1
+        self.color = self.COLORS[alien_type % 4]
         self.score_value = [10, 20, 30, 50][alien_type % 4]
-        self.last_move_time = 0
-        self.move_delay = 500
+
+    @property
+    def x(self):
+        return self.home_x + self.formation.dx if self.formation else self.home_x
+
+    @property
+    def y(self):
+        return self.home_y + self.formation.dy if self.formation else self.home_y
+
+    @classmethod
+    def build_atlas(cls):
+        """Pre-renders every alien type, plain and damage-tinted, so drawing an alien is a single blit."""
+        pad = cls.SPRITE_PAD
+        for alien_type, color in enumerate(cls.COLORS):
+            sprite = pygame.Surface((cls.WIDTH + 2 * pad, cls.HEIGHT + 2 * pad), pygame.SRCALPHA).convert_alpha()
+            cls.draw_shape(sprite, alien_type, color, pad, pad, cls.WIDTH, cls.HEIGHT)
+            damaged = sprite.copy()
+            damaged.fill(cls.DAMAGE_TINT, special_flags=pygame.BLEND_RGB_MULT)
+            cls.atlas[alien_type, False] = sprite
+            cls.atlas[alien_type, True] = damaged
+
+    def blit_item(self):
+        """(sprite, position) pair for Surface.blits."""
+        sprite = self.atlas[self.type % 4, self.health < self.max_health]
+        return sprite, (self.x - self.SPRITE_PAD, self.y - self.SPRITE_PAD)
 
     def draw(self, surface):
+        surface.blit(*self.blit_item())
+
+    @staticmethod
+    def draw_shape(surface, alien_type, color, x, y, width, height):
         # Draw different alien types
-        if self.type == 0:
+        if alien_type == 0:
             # Crab-like alien
             points = [
-                (self.x + 10, self.y + 5),
-                (self.x + 30, self.y + 5),
-                (self.x + 5, self.y + 15),
-                (self.x + 35, self.y + 15),
-                (self.x + 10, self.y + 25),
-                (self.x + 30, self.y + 25)
+                (x + 10, y + 5),
+                (x + 30, y + 5),
+                (x + 5, y + 15),
+                (x + 35, y + 15),
+                (x + 10, y + 25),
+                (x + 30, y + 25)
             ]
-            pygame.draw.polygon(surface, self.color, points)
+            pygame.draw.polygon(surface, color, points)
             pygame.draw.polygon(surface, (255, 200, 200), points, 2)
             # Eyes
-            pygame.draw.circle(surface, WHITE, (self.x + 15, self.y + 15), 4)
-            pygame.draw.circle(surface, WHITE, (self.x + 25, self.y + 15), 4)
-            pygame.draw.circle(surface, BLACK, (self.x + 15, self.y + 15), 2)
-            pygame.draw.circle(surface, BLACK, (self.x + 25, self.y + 15), 2)
+            pygame.draw.circle(surface, WHITE, (x + 15, y + 15), 4)
+            pygame.draw.circle(surface, WHITE, (x + 25, y + 15), 4)
+            pygame.draw.circle(surface, BLACK, (x + 15, y + 15), 2)
+            pygame.draw.circle(surface, BLACK, (x + 25, y + 15), 2)
 
-        elif self.type == 1:
+        elif alien_type == 1:
             # Squid-like alien
-            pygame.draw.ellipse(surface, self.color,
-                                (self.x, self.y, self.width, self.height))
+            pygame.draw.ellipse(surface, color,
+                                (x, y, width, height))
             pygame.draw.ellipse(surface, (255, 200, 200),
-                                (self.x, self.y, self.width, self.height), 2)
+                                (x, y, width, height), 2)
             # Eyes
-            pygame.draw.circle(surface, WHITE, (self.x + 10, self.y + 15), 3)
-            pygame.draw.circle(surface, WHITE, (self.x + 30, self.y + 15), 3)
-            pygame.draw.circle(surface, BLACK, (self.x + 10, self.y + 15), 1)
-            pygame.draw.circle(surface, BLACK, (self.x + 30, self.y + 15), 1)
+            pygame.draw.circle(surface, WHITE, (x + 10, y + 15), 3)
+            pygame.draw.circle(surface, WHITE, (x + 30, y + 15), 3)
+            pygame.draw.circle(surface, BLACK, (x + 10, y + 15), 1)
+            pygame.draw.circle(surface, BLACK, (x + 30, y + 15), 1)
 
-        elif self.type == 2:
+        elif alien_type == 2:
             # Classic UFO shape
-            pygame.draw.ellipse(surface, self.color,
-                                (self.x + 5, self.y, self.width - 10, self.height // 2))
-            pygame.draw.rect(surface, self.color,
-                             (self.x, self.y + self.height // 2, self.width, self.height // 2))
-            pygame.draw.ellipse(surface, self.color,
-                                (self.x + 10, self.y - 5, 20, 15))
+            pygame.draw.ellipse(surface, color,
+                                (x + 5, y, width - 10, height // 2))
+            pygame.draw.rect(surface, color,
+                             (x, y + height // 2, width, height // 2))
+            pygame.draw.ellipse(surface, color,
+                                (x + 10, y - 5, 20, 15))
             pygame.draw.ellipse(surface, (255, 200, 200),
-                                (self.x + 5, self.y, self.width - 10, self.height // 2), 2)
+                                (x + 5, y, width - 10, height // 2), 2)
             # Eyes
-            pygame.draw.circle(surface, WHITE, (self.x + 15, self.y + 15), 3)
-            pygame.draw.circle(surface, WHITE, (self.x + 25, self.y + 15), 3)
+            pygame.draw.circle(surface, WHITE, (x + 15, y + 15), 3)
+            pygame.draw.circle(surface, WHITE, (x + 25, y + 15), 3)
 
         else:  # type 3 - Boss alien
             # Draw larger, menacing alien
-            pygame.draw.ellipse(surface, self.color,
-                                (self.x, self.y, self.width, self.height))
+            pygame.draw.ellipse(surface, color,
+                                (x, y, width, height))
             pygame.draw.ellipse(surface, (255, 200, 0),
-                                (self.x, self.y, self.width, self.height), 3)
+                                (x, y, width, height), 3)
             # Crown/spikes
             for i in range(5):
                 angle = i * 72
-                spike_x = self.x + self.width // 2 + 8 * cos(radians(angle))  # Changed from pygame.math
-                spike_y = self.y + 5 + 8 * sin(radians(angle))  # Changed from pygame.math
+                spike_x = x + width // 2 + 8 * cos(radians(angle))  # Changed from pygame.math
+                spike_y = y + 5 + 8 * sin(radians(angle))  # Changed from pygame.math
                 pygame.draw.line(surface, YELLOW,
-                                 (self.x + self.width // 2, self.y),
+                                 (x + width // 2, y),
                                  (spike_x, spike_y), 3)
             # Eyes
-            pygame.draw.circle(surface, RED, (self.x + 12, self.y + 15), 5)
-            pygame.draw.circle(surface, RED, (self.x + 28, self.y + 15), 5)
-            pygame.draw.circle(surface, YELLOW, (self.x + 12, self.y + 15), 2)
-            pygame.draw.circle(surface, YELLOW, (self.x + 28, self.y + 15), 2)
-
-    def move(self, aliens, current_time):
-        if current_time - self.last_move_time < self.move_delay:
-            return False
-
-        self.last_move_time = current_time
-
-        # Check if any alien needs to move down
-        move_down = False
-        for alien in aliens:
-            if (alien.x <= 10 and alien.direction == -1) or \
-                    (alien.x >= WIDTH - alien.width - 10 and alien.direction == 1):
-                move_down = True
-                break
-
-        if move_down:
-            self.y += 15
-            self.direction *= -1
-        else:
-            self.x += self.speed * self.direction
-
-        return move_down
+            pygame.draw.circle(surface, RED, (x + 12, y + 15), 5)
+            pygame.draw.circle(surface, RED, (x + 28, y + 15), 5)
+            pygame.draw.circle(surface, YELLOW, (x + 12, y + 15), 2)
+            pygame.draw.circle(surface, YELLOW, (x + 28, y + 15), 2)
 
     def can_shoot(self, current_time):
         if current_time - self.shoot_timer > self.shoot_delay:
@@ -438,8 +498,11 @@ class Star:
 
 class Game:
     def __init__(self):
+        if not Alien.atlas:
+            Alien.build_atlas()
         self.player = Player()
         self.aliens = []
+        self.formation = None
         self.player_bullets = []
         self.alien_bullets = []
         self.particles = []
@@ -489,6 +552,8 @@ class Game:
 
     def create_wave(self):
         self.aliens = []
+        # Alien speed and step delay scale with the wave
+        self.formation = Formation(2 * (1 + self.wave * 0.15), max(100, 500 - (self.wave * 40)))
         rows = min(3 + self.wave // 2, 6)
         cols = min(8 + self.wave // 3, 12)
 
@@ -500,12 +565,9 @@ class Game:
                 alien_type = (row + self.wave) % 4
                 x = start_x + col * 50
                 y = start_y + row * 45
-                self.aliens.append(Alien(x, y, alien_type, self.wave))
-
-        # Adjust alien speed based on wave
-        for alien in self.aliens:
-            alien.speed = alien.base_speed * (1 + self.wave * 0.15)
-            alien.move_delay = max(100, 500 - (self.wave * 40))
+                alien = Alien(x, y, alien_type, self.wave, col)
+                self.formation.add(alien)
+                self.aliens.append(alien)
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -620,6 +682,7 @@ class Game:
                             self.powerups.append(PowerUp(alien.x, alien.y, power_type))
 
                         self.aliens.remove(alien)
+                        self.formation.remove(alien)
                         self.player_bullets.remove(bullet)
                         self.screen_shake = min(10, 3 + self.player.combo // 5)
                         break
@@ -631,12 +694,10 @@ class Game:
         # Update alien movement
         if current_time - self.alien_move_timer > self.alien_move_delay:
             self.alien_move_timer = current_time
-            move_down = False
 
             # Move all aliens
-            for alien in self.aliens:
-                if alien.move(self.aliens, current_time):
-                    move_down = True
+            if self.aliens:
+                self.formation.move(current_time, self.aliens[0].width)
 
             # Increase speed as aliens decrease
             if len(self.aliens) > 0:
@@ -703,6 +764,7 @@ class Game:
                             ))
                         self.player.score += alien.score_value * 2
                         self.aliens.remove(alien)
+                        self.formation.remove(alien)
                     self.screen_shake = 30
 
         # Update particles
@@ -770,8 +832,8 @@ class Game:
         # Draw game objects on game surface
         self.player.draw(game_surface)
 
-        for alien in self.aliens:
-            alien.draw(game_surface)
+        # The whole swarm in one batched call
+        game_surface.blits([alien.blit_item() for alien in self.aliens], doreturn=False)
 
         for bullet in self.player_bullets:
             bullet.draw(game_surface)
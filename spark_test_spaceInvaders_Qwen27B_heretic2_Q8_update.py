@@ -459,6 +459,68 @@ class Player:
         ])
 
 
+class PostProcess:
+    """CRT look and screen shake applied after the scene is drawn.
+    The overlay is built once per resolution and set of enabled effects; shake blits the finished frame at an
+    offset. Each effect can be switched on and off with its function key."""
+    TOGGLE_KEYS = {pygame.K_F1: 'scanlines', pygame.K_F2: 'vignette', pygame.K_F3: 'haze', pygame.K_F4: 'shake'}
+
+    def __init__(self, scanlines=True, vignette=True, haze=True, shake=True):
+        self.scanlines = scanlines
+        self.vignette = vignette
+        self.haze = haze
+        self.shake = shake
+        self.overlays = {}  # (size, scanlines, vignette, haze) -> overlay, or None when all are off
+        self.frame = None  # Off-screen frame used while shaking
+
+    def toggle(self, key):
+        if key in self.TOGGLE_KEYS:
+            name = self.TOGGLE_KEYS[key]
+            setattr(self, name, not getattr(self, name))
+
+    def build_overlay(self, size):
+        width, height = size
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        # 1. Slight white haze
+        if self.haze:
+            overlay.fill((255, 255, 255, 20))
+        # 2. Scanlines
+        if self.scanlines:
+            for y in range(0, height, 4):
+                pygame.draw.line(overlay, (0, 0, 0, 100), (0, y), (width, y), 1)
+        # 3. Vignette: a dark base with a lighter circle cut out of the middle, so the edges are darkest
+        if self.vignette:
+            vignette_surf = pygame.Surface(size, pygame.SRCALPHA)
+            vignette_surf.fill((0, 0, 0, 100))
+            center_circle_radius = min(width, height) // 2 - 50
+            pygame.draw.circle(vignette_surf, (0, 0, 0, 50), (width // 2, height // 2), center_circle_radius)
+            overlay.blit(vignette_surf, (0, 0))
+        return overlay
+
+    def overlay(self, size):
+        key = (size, self.scanlines, self.vignette, self.haze)
+        if key not in self.overlays:
+            enabled = self.scanlines or self.vignette or self.haze
+            self.overlays[key] = self.build_overlay(size) if enabled else None
+        return self.overlays[key]
+
+    def target(self, screen, offset):
+        """Surface the scene should be drawn on: the screen itself, or the off-screen frame while shaking."""
+        if offset == (0, 0):
+            return screen
+        if self.frame is None or self.frame.get_size() != screen.get_size():
+            self.frame = pygame.Surface(screen.get_size()).convert()
+        return self.frame
+
+    def present(self, screen, frame, offset):
+        if frame is not screen:
+            screen.fill(BG_COLOR)
+            screen.blit(frame, offset)
+        overlay = self.overlay(screen.get_size())
+        if overlay:
+            screen.blit(overlay, (0, 0))
+
+
 class Game:
     def __init__(self):
         pygame.init()
@@ -469,6 +531,7 @@ class Game:
         self.large_font = pygame.font.SysFont("Courier New", 48, bold=True)
         self.score_font = pygame.font.SysFont("Courier New", 16, bold=True)
         self.sound_manager = SoundManager()
+        self.post = PostProcess()
 
         self.state = "START"
         self.score = 0
@@ -748,134 +811,71 @@ class Game:
                 self.high_score = self.score
 
     def draw(self):
-        # Screen shake effect
-        offset_x = 0
-        offset_y = 0
-        if self.shake_duration > 0:
-            offset_x = random.randint(-self.shake_magnitude, self.shake_magnitude)
-            offset_y = random.randint(-self.shake_magnitude, self.shake_magnitude)
-
-            # Create a temporary surface for the shake
-            temp_screen = pygame.Surface((WIDTH, HEIGHT))
-            temp_screen.fill(BG_COLOR)
-
-            for star in self.stars:
-                star.draw(temp_screen)
-            if self.state == "PLAYING":
-                self.player.draw(temp_screen)
-                for barrier in self.barrriers:
-                    if barrier.active:
-                        barrier.draw(temp_screen)
-                for enemy in self.enemies:
-                    if enemy.active:
-                        enemy.update(pygame.time.get_ticks())
-                        enemy.draw(temp_screen)
-                if self.ufo and self.ufo.active:
-                    self.ufo.draw(temp_screen)
-                for b in self.player.bullets:
-                    b.draw(temp_screen)
-                for b in self.enemy_bullets:
-                    b.draw(temp_screen)
-                for p in self.particles:
-                    p.draw(temp_screen)
-                for sp in self.score_popups:
-                    sp.draw(temp_screen)
-
-                self.screen.blit(temp_screen, (offset_x, offset_y))
-            else:
-                self.screen.blit(temp_screen, (offset_x, offset_y))
-        else:
-            self.screen.fill(BG_COLOR)
-            for star in self.stars:
-                star.draw(self.screen)
-
-            if self.state == "START":
-                self.draw_center_text("SPACE INVADERS", self.large_font, (0, 255, 200), -80)
-                self.draw_center_text("Press SPACE to Start", self.font, TEXT_COLOR, 20)
-                self.draw_center_text("Arrows to Move | SPACE to Shoot", self.font, (150, 150, 150), 70)
-                self.draw_center_text("Protect yourself behind barriers!", self.font, (150, 150, 150), 120)
-            elif self.state == "PLAYING":
-                self.player.draw(self.screen)
-                for barrier in self.barrriers:
-                    if barrier.active:
-                        barrier.draw(self.screen)
-                for enemy in self.enemies:
-                    if enemy.active:
-                        enemy.update(pygame.time.get_ticks())
-                        enemy.draw(self.screen)
-                if self.ufo and self.ufo.active:
-                    self.ufo.draw(self.screen)
-                for b in self.player.bullets:
-                    b.draw(self.screen)
-                for b in self.enemy_bullets:
-                    b.draw(self.screen)
-                for p in self.particles:
-                    p.draw(self.screen)
-                for sp in self.score_popups:
-                    sp.draw(self.screen)
-
-                score_surf = self.font.render(f"SCORE: {self.score}", True, TEXT_COLOR)
-                lives_surf = self.font.render(f"LIVES: {self.player.lives}", True, TEXT_COLOR)
-                level_surf = self.font.render(f"LEVEL: {self.level}", True, TEXT_COLOR)
-                ufo_surf = self.score_font.render("UFO: 150pts", True, UFO_COLOR)
-
-                self.screen.blit(score_surf, (10, 10))
-                self.screen.blit(lives_surf, (WIDTH - 150, 10))
-                self.screen.blit(level_surf, (WIDTH // 2 - 50, 10))
-                self.screen.blit(ufo_surf, (WIDTH // 2 - 80, 40))
-            elif self.state in ["GAMEOVER", "VICTORY"]:
-                title = "GAME OVER" if self.state == "GAMEOVER" else "VICTORY!"
-                color = (255, 50, 50) if self.state == "GAMEOVER" else (50, 255, 50)
-                self.draw_center_text(title, self.large_font, color, -80)
-                self.draw_center_text(f"Final Score: {self.score}", self.font, TEXT_COLOR, -30)
-                self.draw_center_text(f"High Score: {self.high_score}", self.font, (255, 215, 0), 20)
-                self.draw_center_text("Press SPACE to Play Again", self.font, (150, 150, 150), 80)
-
-        # CRT Overlay
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-
-        # 1. Slight white haze (optional)
-        haze_color = (255, 255, 255, 20)
-        overlay.fill(haze_color)
-
-        # 2. Scanlines
-        for y in range(0, HEIGHT, 4):
-            pygame.draw.line(overlay, (0, 0, 0, 100), (0, y), (WIDTH, y), 1)
+        # Screen shake moves the finished frame instead of redrawing the scene
+        offset = (0, 0)
+        if self.shake_duration > 0 and self.post.shake:
+            offset = (random.randint(-self.shake_magnitude, self.shake_magnitude),
+                      random.randint(-self.shake_magnitude, self.shake_magnitude))
+        surface = self.post.target(self.screen, offset)
+        self.draw_scene(surface)
+        self.post.present(self.screen, surface, offset)
 
-        # 3. Vignette Effect (Darkens the corners)
-        # We create a separate surface for the vignette to control alpha blending precisely
-        vignette_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-
-        # Draw a large black circle at the center of the vignette surface
-        # The radius should be large enough to cover the screen diagonally
-        vignette_radius = min(WIDTH, HEIGHT) // 2 + 100  # Make it larger than screen
-        vignette_center = (WIDTH // 2, HEIGHT // 2)
-
-        # We want the edges dark and center light.
-        # So we draw a black circle, but we will invert the logic or use a gradient.
-        # A simpler way: Draw a large black rectangle, then cut out a lighter circle in the middle.
-        vignette_surf.fill((0, 0, 0, 100))  # Dark base for the whole screen
-
-        # Now draw a lighter circle in the middle to "cut out" the view area
-        # We use a radial gradient for the cut-out.
-        # Instead of a complex gradient, let's just draw a large, semi-transparent circle in the middle.
-        # This effectively makes the center less dark than the edges.
-        center_circle_radius = min(WIDTH, HEIGHT) // 2 - 50  # Slightly smaller than screen
-        pygame.draw.circle(vignette_surf, (0, 0, 0, 50), vignette_center, center_circle_radius)
+        pygame.display.flip()
 
-        # Blit the vignette onto the main overlay
-        overlay.blit(vignette_surf, (0, 0))
+    def draw_scene(self, surface):
+        surface.fill(BG_COLOR)
+        for star in self.stars:
+            star.draw(surface)
 
-        self.screen.blit(overlay, (0, 0))
+        if self.state == "START":
+            self.draw_center_text("SPACE INVADERS", self.large_font, (0, 255, 200), -80, surface)
+            self.draw_center_text("Press SPACE to Start", self.font, TEXT_COLOR, 20, surface)
+            self.draw_center_text("Arrows to Move | SPACE to Shoot", self.font, (150, 150, 150), 70, surface)
+            self.draw_center_text("Protect yourself behind barriers!", self.font, (150, 150, 150), 120, surface)
+        elif self.state == "PLAYING":
+            self.player.draw(surface)
+            for barrier in self.barrriers:
+                if barrier.active:
+                    barrier.draw(surface)
+            for enemy in self.enemies:
+                if enemy.active:
+                    enemy.update(pygame.time.get_ticks())
+                    enemy.draw(surface)
+            if self.ufo and self.ufo.active:
+                self.ufo.draw(surface)
+            for b in self.player.bullets:
+                b.draw(surface)
+            for b in self.enemy_bullets:
+                b.draw(surface)
+            for p in self.particles:
+                p.draw(surface)
+            for sp in self.score_popups:
+                sp.draw(surface)
 
-        pygame.display.flip()
+            score_surf = self.font.render(f"SCORE: {self.score}", True, TEXT_COLOR)
+            lives_surf = self.font.render(f"LIVES: {self.player.lives}", True, TEXT_COLOR)
+            level_surf = self.font.render(f"LEVEL: {self.level}", True, TEXT_COLOR)
+            ufo_surf = self.score_font.render("UFO: 150pts", True, UFO_COLOR)
 
-    def draw_center_text(self, text, font, color, y_offset):
+            surface.blit(score_surf, (10, 10))
+            surface.blit(lives_surf, (WIDTH - 150, 10))
+            surface.blit(level_surf, (WIDTH // 2 - 50, 10))
+            surface.blit(ufo_surf, (WIDTH // 2 - 80, 40))
+        elif self.state in ["GAMEOVER", "VICTORY"]:
+            title = "GAME OVER" if self.state == "GAMEOVER" else "VICTORY!"
+            color = (255, 50, 50) if self.state == "GAMEOVER" else (50, 255, 50)
+            self.draw_center_text(title, self.large_font, color, -80, surface)
+            self.draw_center_text(f"Final Score: {self.score}", self.font, TEXT_COLOR, -30, surface)
+            self.draw_center_text(f"High Score: {self.high_score}", self.font, (255, 215, 0), 20, surface)
+            self.draw_center_text("Press SPACE to Play Again", self.font, (150, 150, 150), 80, surface)
+
+    def draw_center_text(self, text, font, color, y_offset, surface=None):
+        surface = surface or self.screen
         text_surf = font.render(text, True, color)
         text_rect = text_surf.get_rect(center=(WIDTH // 2, HEIGHT // 2 + y_offset))
         text_shadow = font.render(text, True, (0, 0, 0))
-        self.screen.blit(text_shadow, (text_rect.x + 2, text_rect.y + 2))
-        self.screen.blit(text_surf, text_rect)
+        surface.blit(text_shadow, (text_rect.x + 2, text_rect.y + 2))
+        surface.blit(text_surf, text_rect)
 
     def run(self):
         running = True
@@ -883,6 +883,8 @@ class Game:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.KEYDOWN:
+                    self.post.toggle(event.key)
             self.handle_input()
             self.update_logic()
             self.draw()
@@ -12,14 +12,17 @@ No external asset files required. All graphics and sounds are generated programm
 """
 
 import pygame
+import io
 import math
 import json
 import os
 import random
 import wave
-import struct
+import hashlib
 from enum import Enum
 
+import numpy as np
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -27,6 +30,8 @@ from enum import Enum
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 700
 FPS = 60
+MAX_PARTICLES = 1500  # When full, new explosions replace the oldest particles
+BARRIER_BUCKET_WIDTH = 32  # Barriers are bucketed by x in strips this wide for bullet tests
 
 # Colors
 COLOR_BLACK = (0, 0, 0)
@@ -43,168 +48,250 @@ COLOR_DARK_BLUE = (10, 10, 60)
 # File paths for saving game data
 STATS_FILE = "space_invaders_stats.json"
 HIGH_SCORE_FILE = "space_invaders_highscores.json"
+SOUND_CACHE_DIR = "space_invaders_sounds"  # Synthesized effects are cached here as WAV files; None disables the cache
 
 
 # ============================================================================
 # SOUND SYSTEM - Programmatic Sound Generation
 # ============================================================================
 
+# Each effect is a sequence of (frequency, duration, volume, wave_type, fade_out) segments played back to back
+SOUND_EFFECTS = {
+    'shoot': [(800, 0.1, 0.4, 'sine', True)],
+    'enemy_shoot': [(300, 0.15, 0.3, 'square', True)],
+    'explosion': [(150, 0.3, 0.5, 'noise', True)],
+    'big_explosion': [(100, 0.5, 0.6, 'noise', True)],
+    'level_up': [(freq, 0.15, 0.4, 'sine', False) for freq in (523, 659, 784, 1047)],  # C major arpeggio
+    'bonus': [(freq, 0.1, 0.35, 'sine', False) for freq in (600, 800, 1200)],
+    'game_over': [(freq, 0.2, 0.4, 'sine', False) for freq in (400, 350, 300, 200, 150)],
+    'start': [(freq, 0.2, 0.4, 'sine', False) for freq in (261, 329, 392, 523)],
+}
+
+
 class SoundGenerator:
-    """Generates and plays sounds without external files."""
+    """Generates and plays sounds without external files.
+    Every effect is synthesized once by load_bank(); playing one afterwards only hands a ready Sound to the mixer."""
+
+    bank = {}  # effect name -> pygame.mixer.Sound
 
     @staticmethod
     def _generate_wave(frequency, duration, volume=0.3, sample_rate=44100,
-                       wave_type='sine', fade_out=False):
-        """Generate audio data as bytes."""
+                       wave_type='sine', fade_out=False, rng=None):
+        """Generate one segment as float samples in [-volume, volume]."""
         num_samples = int(duration * sample_rate)
-        buffer = bytearray()
-
-        for i in range(num_samples):
-            t = i / sample_rate
-            time_factor = i / num_samples
-
-            if wave_type == 'sine':
-                sample = math.sin(2 * math.pi * frequency * t)
-            elif wave_type == 'square':
-                sample = 1 if math.sin(2 * math.pi * frequency * t) > 0 else -1
-            elif wave_type == 'sawtooth':
-                sample = 2 * (t * frequency - math.floor(t * frequency + 0.5))
-            elif wave_type == 'noise':
-                sample = random.random() * 2 - 1
-            elif wave_type == 'triangle':
-                sample = 2 * abs(2 * (t * frequency - math.floor(t * frequency + 0.25)) - 1) - 1
+        t = np.arange(num_samples) / sample_rate
+        phase = t * frequency
+
+        if wave_type == 'sine':
+            samples = np.sin(2 * np.pi * phase)
+        elif wave_type == 'square':
+            samples = np.where(np.sin(2 * np.pi * phase) > 0, 1.0, -1.0)
+        elif wave_type == 'sawtooth':
+            samples = 2 * (phase - np.floor(phase + 0.5))
+        elif wave_type == 'noise':
+            samples = (rng or np.random.default_rng()).random(num_samples) * 2 - 1
+        elif wave_type == 'triangle':
+            samples = 2 * np.abs(2 * (phase - np.floor(phase + 0.25)) - 1) - 1
+        else:
+            raise ValueError(f"Unknown wave type: {wave_type}")
 
-            # Apply fade out
-            if fade_out:
-                sample *= (1 - time_factor)
+        # Apply fade out
+        if fade_out:
+            samples = samples * (1 - np.arange(num_samples) / num_samples)
 
-            # Apply volume
-            sample *= volume
-            sample *= 32767  # Scale to 16-bit
+        return samples * volume
 
-            buffer.extend(struct.pack('<h', int(sample)))
+    @classmethod
+    def synthesize(cls, segments, sample_rate, channels):
+        """Render an effect as a signed 16-bit WAV file in memory."""
+        rng = np.random.default_rng(0)  # Fixed seed: noise effects are identical on every run, so they can be cached
+        samples = np.concatenate([cls._generate_wave(freq, duration, volume, sample_rate, wave_type, fade_out, rng)
+                                  for freq, duration, volume, wave_type, fade_out in segments])
+        pcm = (samples * 32767).astype(np.int16)
+        data = io.BytesIO()
+        with wave.open(data, 'wb') as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(np.repeat(pcm, channels).tobytes())
+        return data.getvalue()
 
-        return buffer
+    @classmethod
+    def load_bank(cls, cache_dir=SOUND_CACHE_DIR):
+        """Build every effect in SOUND_EFFECTS for the current mixer, reusing cached WAV files when the effect's
+        parameters are unchanged. Sounds are always loaded from WAV data, so SDL converts the samples to the
+        mixer's sample format. Does nothing if the mixer is not initialized."""
+        mixer_format = pygame.mixer.get_init()
+        if not mixer_format:
+            return
+        sample_rate, _, channels = mixer_format
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        for name, segments in SOUND_EFFECTS.items():
+            key = hashlib.sha1(repr((segments, sample_rate, channels)).encode()).hexdigest()[:12]
+            path = os.path.join(cache_dir, f"{name}_{key}.wav") if cache_dir else None
+            if path and os.path.exists(path):
+                try:
+                    cls.bank[name] = pygame.mixer.Sound(path)
+                    continue
+                except pygame.error:
+                    pass  # Unreadable cache entry: synthesize it again below
+            data = cls.synthesize(segments, sample_rate, channels)
+            cls.bank[name] = pygame.mixer.Sound(file=io.BytesIO(data))
+            if path:
+                try:
+                    with open(path, 'wb') as f:
+                        f.write(data)
+                except OSError as e:
+                    print(f"Could not cache sound {name}: {e}")
 
-    @staticmethod
-    def _play_sound(buffer):
-        """Play audio buffer through pygame mixer."""
-        if pygame.mixer.get_init():
-            sound = pygame.sound.make_sound(buffer)
+    @classmethod
+    def _play_sound(cls, name):
+        """Play a pre-synthesized effect through pygame mixer."""
+        sound = cls.bank.get(name)
+        if sound:
             sound.play()
 
     @classmethod
     def play_shoot(cls):
         """Player shooting sound."""
-        buf = cls._generate_wave(800, 0.1, volume=0.4, wave_type='sine', fade_out=True)
-        cls._play_sound(buf)
+        cls._play_sound('shoot')
 
     @classmethod
     def play_enemy_shoot(cls):
         """Enemy shooting sound."""
-        buf = cls._generate_wave(300, 0.15, volume=0.3, wave_type='square', fade_out=True)
-        cls._play_sound(buf)
+        cls._play_sound('enemy_shoot')
 
     @classmethod
     def play_explosion(cls):
         """Explosion sound."""
-        buf = cls._generate_wave(150, 0.3, volume=0.5, wave_type='noise', fade_out=True)
-        cls._play_sound(buf)
+        cls._play_sound('explosion')
 
     @classmethod
     def play_big_explosion(cls):
         """Bigger explosion for bonus ship."""
-        buf = cls._generate_wave(100, 0.5, volume=0.6, wave_type='noise', fade_out=True)
-        cls._play_sound(buf)
+        cls._play_sound('big_explosion')
 
     @classmethod
     def play_level_up(cls):
         """Level up jingle."""
-        buf = bytearray()
-        frequencies = [523, 659, 784, 1047]  # C major arpeggio
-        for freq in frequencies:
-            segment = cls._generate_wave(freq, 0.15, volume=0.4, wave_type='sine', fade_out=False)
-            buf.extend(segment)
-        cls._play_sound(buf)
+        cls._play_sound('level_up')
 
     @classmethod
     def play_bonus(cls):
         """Bonus pickup sound."""
-        buf = bytearray()
-        for freq in [600, 800, 1200]:
-            segment = cls._generate_wave(freq, 0.1, volume=0.35, wave_type='sine', fade_out=False)
-            buf.extend(segment)
-        cls._play_sound(buf)
+        cls._play_sound('bonus')
 
     @classmethod
     def play_game_over(cls):
         """Game over sound."""
-        buf = bytearray()
-        frequencies = [400, 350, 300, 200, 150]
-        for freq in frequencies:
-            segment = cls._generate_wave(freq, 0.2, volume=0.4, wave_type='sine', fade_out=False)
-            buf.extend(segment)
-        cls._play_sound(buf)
+        cls._play_sound('game_over')
 
     @classmethod
     def play_start(cls):
         """Game start sound."""
-        buf = bytearray()
-        frequencies = [261, 329, 392, 523]
-        for freq in frequencies:
-            segment = cls._generate_wave(freq, 0.2, volume=0.4, wave_type='sine', fade_out=False)
-            buf.extend(segment)
-        cls._play_sound(buf)
+        cls._play_sound('start')
 
 
 # ============================================================================
 # PARTICLE SYSTEM
 # ============================================================================
 
-class Particle:
-    """A single particle for visual effects."""
-
-    def __init__(self, x, y, color, speed, angle, lifetime, size=2):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.speed = speed
-        self.angle = angle
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = size
+class ParticleSystem:
+    """Fixed-capacity particle pool stored as parallel NumPy arrays.
+    Live particles occupy the first `count` slots; dead ones are filled by swap-remove, and when the pool is full
+    the oldest particles are dropped to make room."""
+
+    GRAVITY = 0.05
+
+    def __init__(self, capacity=MAX_PARTICLES):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.vx = np.zeros(capacity, np.float32)
+        self.vy = np.zeros(capacity, np.float32)
+        self.lifetime = np.zeros(capacity, np.int32)
+        self.max_lifetime = np.ones(capacity, np.int32)
+        self.size = np.zeros(capacity, np.int32)
+        self.color = np.zeros(capacity, np.int32)  # Index into palette
+        self.birth = np.zeros(capacity, np.int64)  # Emission order, for dropping the oldest
+        self.emitted = 0
+        self.palette = [COLOR_WHITE]
+        self.palette_index = {COLOR_WHITE: 0}
+        self.stamps = {}  # (color index, radius) -> pre-drawn circle
+
+    def __len__(self):
+        return self.count
+
+    def _arrays(self):
+        return (self.x, self.y, self.vx, self.vy, self.lifetime, self.max_lifetime, self.size, self.color, self.birth)
+
+    def emit(self, x, y, color, count=20):
+        """Burst of `count` particles from (x, y); about half of them are white."""
+        count = min(count, self.capacity)
+        overflow = self.count + count - self.capacity
+        if overflow > 0:
+            oldest = np.argpartition(self.birth[:self.count], overflow - 1)[:overflow]
+            self.lifetime[oldest] = 0
+            self._compact()
+        if color not in self.palette_index:
+            self.palette_index[color] = len(self.palette)
+            self.palette.append(color)
+
+        new = slice(self.count, self.count + count)
+        angle = np.random.uniform(0, 2 * math.pi, count)
+        speed = np.random.uniform(1, 5, count)
+        self.x[new] = x
+        self.y[new] = y
+        self.vx[new] = np.cos(angle) * speed
+        self.vy[new] = np.sin(angle) * speed
+        self.lifetime[new] = self.max_lifetime[new] = np.random.randint(20, 51, count)
+        self.size[new] = np.random.randint(1, 5, count)
+        self.color[new] = np.where(np.random.random(count) < 0.5, 0, self.palette_index[color])
+        self.birth[new] = np.arange(self.emitted, self.emitted + count)
+        self.emitted += count
+        self.count += count
 
     def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.05  # slight gravity
-        self.lifetime -= 1
+        live = slice(0, self.count)
+        self.x[live] += self.vx[live]
+        self.y[live] += self.vy[live]
+        self.vy[live] += self.GRAVITY
+        self.lifetime[live] -= 1
+        self._compact()
+
+    def _compact(self):
+        """Swap-remove: dead slots below the new count are filled from the live particles above it."""
+        alive = self.lifetime[:self.count] > 0
+        remaining = int(np.count_nonzero(alive))
+        if remaining == self.count:
+            return
+        holes = np.flatnonzero(~alive[:remaining])
+        movers = np.flatnonzero(alive[remaining:]) + remaining
+        for array in self._arrays():
+            array[holes] = array[movers]
+        self.count = remaining
+
+    def _stamp(self, color, radius):
+        key = (color, radius)
+        if key not in self.stamps:
+            stamp = pygame.Surface((2 * radius, 2 * radius))
+            stamp.set_colorkey(COLOR_BLACK)
+            pygame.draw.circle(stamp, self.palette[color], (radius, radius), radius)
+            self.stamps[key] = stamp
+        return self.stamps[key]
 
     def draw(self, screen):
-        alpha = self.lifetime / self.max_lifetime
-        if alpha > 0:
-            pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)),
-                               max(1, int(self.size * alpha)))
-
-    def is_alive(self):
-        return self.lifetime > 0
-
-    @classmethod
-    def create_explosion(cls, x, y, color, count=20):
-        """Create an explosion of particles."""
-        particles = []
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 5)
-            lifetime = random.randint(20, 50)
-            size = random.randint(1, 4)
-            c = color
-            if random.random() < 0.5:
-                c = COLOR_WHITE
-            particles.append(cls(x, y, c, speed, angle, lifetime, size))
-        return particles
+        """All particles as pre-drawn circle stamps in one Surface.blits call, shrinking as they age."""
+        if not self.count:
+            return
+        live = slice(0, self.count)
+        radius = np.maximum(1, (self.size[live] * self.lifetime[live] / self.max_lifetime[live]).astype(np.int32))
+        left = self.x[live].astype(np.int32) - radius
+        top = self.y[live].astype(np.int32) - radius
+        screen.blits([(self._stamp(color, r), (px, py)) for color, r, px, py in
+                      zip(self.color[live].tolist(), radius.tolist(), left.tolist(), top.tolist())], doreturn=False)
 
 
 # ============================================================================
@@ -395,6 +482,8 @@ class Alien:
         self.height = 25
         self.active = True
         self.animation_frame = 0
+        self.row = self.col = 0  # Cell in the AlienFormation
+        self._update_rect()
 
         # Points based on type
         self.points = [30, 20, 10][alien_type]
@@ -404,6 +493,15 @@ class Alien:
     def update(self):
         self.animation_frame = (self.animation_frame + 1) % 60
 
+    def move(self, dx, dy):
+        self.x += dx
+        self.y += dy
+        self._update_rect()
+
+    def _update_rect(self):
+        """Cached collision rect, rebuilt only when the alien moves."""
+        self.rect = pygame.Rect(self.x - self.width // 2, self.y - self.height // 2, self.width, self.height)
+
     def draw(self, screen):
         if not self.active:
             return
@@ -453,8 +551,47 @@ class Alien:
                                  (cx + dx + wave, cy + 18), 2)
 
     def get_rect(self):
-        return pygame.Rect(self.x - self.width // 2, self.y - self.height // 2,
-                           self.width, self.height)
+        return self.rect
+
+
+class AlienFormation:
+    """Collision broadphase for the alien grid.
+    Live aliens always move together, so each stays centred in its (row, col) cell relative to a shared origin,
+    and a bullet's position maps straight to the one or two aliens it could be touching."""
+
+    def __init__(self, x, y, spacing_x, spacing_y, rows, cols):
+        self.x = x  # Centre of cell (0, 0)
+        self.y = y
+        self.spacing_x = spacing_x
+        self.spacing_y = spacing_y
+        self.cells = [[None] * cols for _ in range(rows)]
+
+    def add(self, alien, row, col):
+        alien.row, alien.col = row, col
+        self.cells[row][col] = alien
+
+    def remove(self, alien):
+        self.cells[alien.row][alien.col] = None
+
+    def move(self, dx, dy):
+        self.x += dx
+        self.y += dy
+
+    def _span(self, low, high, origin, spacing, count):
+        """Cell indices whose half-spacing band around the cell centre overlaps [low, high)."""
+        first = int((low - origin) / spacing + 0.5)
+        last = int((high - 1 - origin) / spacing + 0.5)
+        return range(max(0, first), min(count - 1, last) + 1)
+
+    def hit_test(self, rect):
+        """The live alien whose rect overlaps rect, or None."""
+        cols = self._span(rect.left, rect.right, self.x, self.spacing_x, len(self.cells[0]))
+        for row in self._span(rect.top, rect.bottom, self.y, self.spacing_y, len(self.cells)):
+            for col in cols:
+                alien = self.cells[row][col]
+                if alien and alien.active and rect.colliderect(alien.rect):
+                    return alien
+        return None
 
 
 class BonusShip:
@@ -567,58 +704,69 @@ class PowerUp:
 
 
 class Barrier:
-    """Destructible barrier/shield for the player to hide behind."""
+    """Destructible barrier/shield for the player to hide behind.
+    Its shape is a pixel occupancy mask with a matching cached surface; hits stamp a circular hole into both."""
+
+    BLOCK_SIZE = 4  # The arch is laid out in blocks of this many pixels
+    _kernels = {}  # radius -> (circle mask, surface that clears the circle's pixels when multiplied in)
+    _rect_masks = {}  # (width, height) -> filled mask used for bullet overlap tests
 
     def __init__(self, x, y, width=60, height=40):
-        self.x = x
-        self.y = y
+        self.x = int(x)
+        self.y = int(y)
         self.width = width
         self.height = height
-        self.blocks = []
-        self._build_barrier()
-
-    def _build_barrier():
-        """Build a barrier with destructible blocks."""
-        # Build arch shape
-        blocks = []
-        block_size = 4
-        for row in range(self.height // block_size):
-            for col in range(self.width // block_size):
-                bx = self.x + col * block_size
-                by = self.y + row * block_size
-
-                # Create arch shape - remove blocks in the arch
-                is_arch = False
-                if row >= (self.height // block_size - 4):
-                    # Bottom arch
-                    center = (self.width // block_size) // 2
-                    if center - 2 <= col <= center + 2:
-                        is_arch = True
-
-                if not is_arch:
-                    blocks.append({'x': bx, 'y': by, 'active': True})
-        self.blocks = blocks
+        self.rect = pygame.Rect(self.x, self.y, width, height)
+        self.mask = self._build_barrier()
+        self.surface = self.mask.to_surface(setcolor=COLOR_GREEN, unsetcolor=(0, 0, 0, 0))
+
+    def _build_barrier(self):
+        """Build the arch-shaped occupancy mask."""
+        mask = pygame.mask.Mask((self.width, self.height), fill=True)
+        # Create arch shape - cut the bottom-centre opening out of the solid block
+        block_size = self.BLOCK_SIZE
+        center = (self.width // block_size) // 2
+        arch = pygame.mask.Mask((5 * block_size, 4 * block_size), fill=True)
+        mask.erase(arch, ((center - 2) * block_size, (self.height // block_size - 4) * block_size))
+        return mask
+
+    @classmethod
+    def _kernel(cls, radius):
+        if radius not in cls._kernels:
+            size = 2 * radius
+            circle = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(circle, COLOR_WHITE, (radius, radius), radius)
+            kernel = pygame.mask.from_surface(circle)
+            eraser = kernel.to_surface(setcolor=(0, 0, 0, 0), unsetcolor=(255, 255, 255, 255))
+            cls._kernels[radius] = (kernel, eraser)
+        return cls._kernels[radius]
+
+    def collide(self, rect):
+        """First intact barrier pixel under rect, in screen coordinates, or None."""
+        if not self.rect.colliderect(rect):
+            return None
+        size = (max(1, int(rect.width)), max(1, int(rect.height)))
+        if size not in self._rect_masks:
+            self._rect_masks[size] = pygame.mask.Mask(size, fill=True)
+        point = self.mask.overlap(self._rect_masks[size], (rect.x - self.x, rect.y - self.y))
+        return (self.x + point[0], self.y + point[1]) if point else None
 
     def hit(self, x, y, radius=8):
-        """Remove blocks within radius of hit point. Return True if hit."""
-        hit = False
-        for block in self.blocks:
-            if block['active']:
-                dx = block['x'] - x
-                dy = block['y'] - y
-                if (dx * dx + dy * dy) < (radius * radius):
-                    block['active'] = False
-                    hit = True
-        return hit
+        """Erode a circle around the hit point. Return True if anything was removed."""
+        kernel, eraser = self._kernel(radius)
+        offset = (int(x) - self.x - radius, int(y) - self.y - radius)
+        if not self.mask.overlap(kernel, offset):
+            return False
+        self.mask.erase(kernel, offset)
+        self.surface.blit(eraser, offset, special_flags=pygame.BLEND_RGBA_MULT)
+        return True
 
     def draw(self, screen):
-        for block in self.blocks:
-            if block['active']:
-                pygame.draw.rect(screen, COLOR_GREEN,
-                                 (block['x'], block['y'], 4, 4))
+        screen.blit(self.surface, self.rect)
 
     def get_active_blocks(self):
-        return sum(1 for b in self.blocks if b['active'])
+        """Number of intact pixels."""
+        return self.mask.count()
 
 
 # ============================================================================
@@ -786,6 +934,7 @@ class SpaceInvadersGame:
     def __init__(self):
         pygame.init()
         pygame.mixer.init(frequency=44100, size=16, channels=2, buffer=4096)
+        SoundGenerator.load_bank()
 
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Space Invaders")
@@ -806,10 +955,12 @@ class SpaceInvadersGame:
         self.level_manager = LevelManager()
         self.player = Player()
         self.aliens = []
+        self.alien_formation = None
         self.player_bullets = []
         self.alien_bullets = []
         self.barriers = []
-        self.particles = []
+        self.barrier_buckets = {}  # x strip -> barriers overlapping it
+        self.particles = ParticleSystem()
         self.powerups = []
         self.bonus_ship = BonusShip()
 
@@ -846,13 +997,16 @@ class SpaceInvadersGame:
         spacing_y = 45
         start_x = SCREEN_WIDTH // 2 - (config['cols'] - 1) * spacing_x // 2
         start_y = 80
+        self.alien_formation = AlienFormation(start_x, start_y, spacing_x, spacing_y, config['rows'], config['cols'])
 
         for row in range(config['rows']):
             for col in range(config['cols']):
                 alien_type = min(2, row)  # Type based on row
                 x = start_x + col * spacing_x
                 y = start_y + row * spacing_y
-                self.aliens.append(Alien(x, y, alien_type))
+                alien = Alien(x, y, alien_type)
+                self.alien_formation.add(alien, row, col)
+                self.aliens.append(alien)
 
         # Create barriers
         self.barriers = []
@@ -861,6 +1015,11 @@ class SpaceInvadersGame:
             bx = barrier_spacing * (i + 1) - 30
             by = SCREEN_HEIGHT - 130
             self.barriers.append(Barrier(bx, by))
+        self.barrier_buckets = {}
+        for barrier in self.barriers:
+            for bucket in range(barrier.rect.left // BARRIER_BUCKET_WIDTH,
+                                (barrier.rect.right - 1) // BARRIER_BUCKET_WIDTH + 1):
+                self.barrier_buckets.setdefault(bucket, []).append(barrier)
 
         # Clear bullets
         self.player_bullets = []
@@ -940,6 +1099,14 @@ class SpaceInvadersGame:
         self.init_level()
         SoundGenerator.play_start()
 
+    def barriers_at(self, rect):
+        """Barriers whose x-range can overlap rect, from the pre-bucketed strips."""
+        left, right = rect.left // BARRIER_BUCKET_WIDTH, (rect.right - 1) // BARRIER_BUCKET_WIDTH
+        barriers = self.barrier_buckets.get(left, [])
+        if right != left:
+            barriers = list(dict.fromkeys(barriers + self.barrier_buckets.get(right, [])))
+        return barriers
+
     def update_stars(self):
         """Update background stars."""
         for star in self.stars:
@@ -990,14 +1157,16 @@ class SpaceInvadersGame:
                     should_drop = True
                     break
 
+            if should_drop:
+                dx, dy = 0, config['alien_drop_distance']
+            else:
+                dx, dy = self.alien_direction * config['alien_speed'], 0
+            self.alien_formation.move(dx, dy)
             for alien in active_aliens:
-                if should_drop:
-                    alien.y += config['alien_drop_distance']
-                    # Check if alien reached player
-                    if alien.y + alien.height // 2 >= self.player.y - self.player.height // 2:
-                        self.game_over()
-                else:
-                    alien.x += self.alien_direction * config['alien_speed']
+                alien.move(dx, dy)
+                # Check if alien reached player
+                if should_drop and alien.y + alien.height // 2 >= self.player.y - self.player.height // 2:
+                    self.game_over()
 
             if should_drop:
                 self.alien_direction *= -1
@@ -1025,38 +1194,39 @@ class SpaceInvadersGame:
                 continue
 
             # Check collision with aliens
-            for alien in self.aliens:
-                if alien.active and bullet.get_rect().colliderect(alien.get_rect()):
-                    alien.active = False
-                    bullet.active = False
-                    self.score += alien.points
-                    self.stats['total_aliens_killed'] += 1
-                    SoundGenerator.play_explosion()
-                    self.particles.extend(Particle.create_explosion(alien.x, alien.y, alien.color, 15))
-
-                    # Chance to drop power-up from aliens
-                    if random.random() < 0.05:
-                        self.powerups.append(PowerUp(alien.x, alien.y))
-                    break
+            bullet_rect = bullet.get_rect()
+            alien = self.alien_formation.hit_test(bullet_rect)
+            if alien:
+                alien.active = False
+                self.alien_formation.remove(alien)
+                bullet.active = False
+                self.score += alien.points
+                self.stats['total_aliens_killed'] += 1
+                SoundGenerator.play_explosion()
+                self.particles.emit(alien.x, alien.y, alien.color, 15)
+
+                # Chance to drop power-up from aliens
+                if random.random() < 0.05:
+                    self.powerups.append(PowerUp(alien.x, alien.y))
 
             # Check collision with bonus ship
-            if self.bonus_ship.active and bullet.get_rect().colliderect(self.bonus_ship.get_rect()):
+            if self.bonus_ship.active and bullet_rect.colliderect(self.bonus_ship.get_rect()):
                 self.score += self.bonus_ship.points
                 bullet.active = False
                 self.bonus_ship.active = False
                 SoundGenerator.play_big_explosion()
-                self.particles.extend(Particle.create_explosion(
-                    self.bonus_ship.x, self.bonus_ship.y, COLOR_PURPLE, 30))
+                self.particles.emit(self.bonus_ship.x, self.bonus_ship.y, COLOR_PURPLE, 30)
                 # Drop power-up
                 self.powerups.append(PowerUp(self.bonus_ship.x, self.bonus_ship.y))
 
             # Check collision with barriers
-            for barrier in self.barriers:
-                if bullet.get_rect().collidepoint(int(bullet.x), int(bullet.y)):
-                    barrier.hit(bullet.x, bullet.y, 6)
+            for barrier in self.barriers_at(bullet_rect):
+                point = barrier.collide(bullet_rect)
+                if point:
+                    barrier.hit(point[0], point[1], 6)
                     bullet.active = False
-                    self.particles.extend(Particle.create_explosion(
-                        bullet.x, bullet.y, COLOR_GREEN, 5))
+                    self.particles.emit(point[0], point[1], COLOR_GREEN, 5)
+                    break
 
         # Update alien bullets
         for bullet in self.alien_bullets[:]:
@@ -1066,20 +1236,19 @@ class SpaceInvadersGame:
                 continue
 
             # Check collision with player
+            bullet_rect = bullet.get_rect()
             if self.player.visible or not self.player.invincible:
-                if bullet.get_rect().colliderect(self.player.get_rect()):
+                if bullet_rect.colliderect(self.player.get_rect()):
                     if not self.player.invincible:
                         if self.player.shield:
                             self.player.shield = False
                             self.player.shield_timer = 0
                             SoundGenerator.play_explosion()
-                            self.particles.extend(Particle.create_explosion(
-                                bullet.x, bullet.y, COLOR_CYAN, 10))
+                            self.particles.emit(bullet.x, bullet.y, COLOR_CYAN, 10)
                         else:
                             self.player.lives -= 1
                             SoundGenerator.play_big_explosion()
-                            self.particles.extend(Particle.create_explosion(
-                                self.player.x, self.player.y, COLOR_GREEN, 25))
+                            self.particles.emit(self.player.x, self.player.y, COLOR_GREEN, 25)
                             if self.player.lives <= 0:
                                 self.game_over()
                             else:
@@ -1087,12 +1256,13 @@ class SpaceInvadersGame:
                     bullet.active = False
 
             # Check collision with barriers
-            for barrier in self.barriers:
-                if bullet.get_rect().collidepoint(int(bullet.x), int(bullet.y)):
-                    barrier.hit(bullet.x, bullet.y, 6)
+            for barrier in self.barriers_at(bullet_rect):
+                point = barrier.collide(bullet_rect)
+                if point:
+                    barrier.hit(point[0], point[1], 6)
                     bullet.active = False
-                    self.particles.extend(Particle.create_explosion(
-                        bullet.x, bullet.y, COLOR_GREEN, 5))
+                    self.particles.emit(point[0], point[1], COLOR_GREEN, 5)
+                    break
 
         # Update bonus ship
         self.bonus_timer -= 1
@@ -1126,10 +1296,7 @@ class SpaceInvadersGame:
                 powerup.active = False
 
         # Update particles
-        for particle in self.particles[:]:
-            particle.update()
-            if not particle.is_alive():
-                self.particles.remove(particle)
+        self.particles.update()
 
         # Check if level is complete
         if not any(a.active for a in self.aliens):
@@ -1271,8 +1438,7 @@ class SpaceInvadersGame:
             powerup.draw(self.screen)
 
         # Draw particles
-        for particle in self.particles:
-            particle.draw(self.screen)
+        self.particles.draw(self.screen)
 
         # Draw top border
         pygame.draw.line(self.screen, COLOR_CYAN, (0, 0), (SCREEN_WIDTH, 0), 2)
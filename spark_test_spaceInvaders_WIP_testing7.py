@@ -331,15 +331,24 @@ class Bullet:
         pygame.draw.rect(surface, WHITE, (self.x - 1, self.y - self.h // 2 + 2, 2, self.h - 4))
 
 class Bunker:
+    """Blocks live in a flat grid of cells (1 = intact), so a hit maps straight to the cells it covers.
+    The bunker is pre-rendered once; eroding a block only clears that block's pixels on the cached surface."""
+
+    BASE_COLOR = (0, 170, 90)
+    EDGE_COLOR = (0, 255, 140)
+
     def __init__(self, x, y, block_size=4, grid_w=15, grid_h=10):
         self.x = x
         self.y = y
         self.block_size = block_size
-        self.blocks = []
-        self._build_shape(grid_w, grid_h)
+        self.grid_w, self.grid_h = grid_w, grid_h
+        self.cells = bytearray(grid_w * grid_h)
         self.rect = pygame.Rect(x, y, grid_w * block_size, grid_h * block_size)
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self._build_shape(grid_w, grid_h)
 
     def _build_shape(self, w, h):
+        bs = self.block_size
         for gy in range(h):
             for gx in range(w):
                 cx = gx - (w - 1) / 2
@@ -347,51 +356,56 @@ class Bunker:
                     continue
                 if gy >= h - 3 and abs(cx) < 3:
                     continue
-                self.blocks.append(pygame.Rect(
-                    self.x + gx * self.block_size,
-                    self.y + gy * self.block_size,
-                    self.block_size, self.block_size
-                ))
+                self.cells[gy * w + gx] = 1
+                pygame.draw.rect(self.surface, self.BASE_COLOR, (gx * bs, gy * bs, bs, bs))
+                pygame.draw.rect(self.surface, self.EDGE_COLOR, (gx * bs + 1, gy * bs + 1, bs - 2, bs - 2), 1)
 
     def draw(self, surface, t):
+        # The pulse is an alpha modulation of the whole cached surface instead of a per-block color
         pulse = 0.82 + 0.18 * math.sin(t * 0.003)
-        base = (0, 170, 90)
-        for r in self.blocks:
-            c = (int(base[0] * pulse), int(base[1] * pulse), int(base[2] * pulse))
-            pygame.draw.rect(surface, c, r)
-            pygame.draw.rect(surface, (0, 255, 140), (r.x + 1, r.y + 1, r.w - 2, r.h - 2), 1)
+        self.surface.set_alpha(int(255 * pulse))
+        surface.blit(self.surface, self.rect)
+
+    def _remove(self, gx, gy, particles, vx, vy, life):
+        bs = self.block_size
+        self.cells[gy * self.grid_w + gx] = 0
+        self.surface.fill((0, 0, 0, 0), (gx * bs, gy * bs, bs, bs))
+        if particles:
+            particles.append(Particle(
+                self.x + gx * bs + bs // 2, self.y + gy * bs + bs // 2,
+                random.uniform(-vx, vx), random.uniform(*vy),
+                (0, 255, 110), life, size=2, trail=True
+            ))
+
+    def _cell_range(self, left, top, right, bottom):
+        """Grid cells overlapping the pixel span [left, right) x [top, bottom), clamped to the grid."""
+        bs = self.block_size
+        gx0, gy0 = max(0, int((left - self.x) // bs)), max(0, int((top - self.y) // bs))
+        gx1 = min(self.grid_w - 1, int((right - 1 - self.x) // bs))
+        gy1 = min(self.grid_h - 1, int((bottom - 1 - self.y) // bs))
+        return gx0, gy0, gx1, gy1
 
     def erode_at(self, px, py, radius_blocks, particles=None):
-        to_remove = []
-        for r in self.blocks:
-            dx = (px - r.centerx) / self.block_size
-            dy = (py - r.centery) / self.block_size
-            if dx * dx + dy * dy <= radius_blocks * radius_blocks:
-                to_remove.append(r)
-                if particles:
-                    particles.append(Particle(
-                        r.centerx, r.centery,
-                        random.uniform(-1.5, 1.5), random.uniform(-1.8, -0.4),
-                        (0, 255, 110), 0.35, size=2, trail=True
-                    ))
-        for r in to_remove:
-            if r in self.blocks:
-                self.blocks.remove(r)
+        bs, cells, w = self.block_size, self.cells, self.grid_w
+        reach = radius_blocks * bs
+        gx0, gy0, gx1, gy1 = self._cell_range(px - reach, py - reach, px + reach + 1, py + reach + 1)
+        for gy in range(gy0, gy1 + 1):
+            dy = (py - (self.y + gy * bs + bs // 2)) / bs
+            for gx in range(gx0, gx1 + 1):
+                if cells[gy * w + gx]:
+                    dx = (px - (self.x + gx * bs + bs // 2)) / bs
+                    if dx * dx + dy * dy <= radius_blocks * radius_blocks:
+                        self._remove(gx, gy, particles, 1.5, (-1.8, -0.4), 0.35)
 
     def erode_rect(self, rect, particles=None):
-        to_remove = []
-        for r in self.blocks:
-            if r.colliderect(rect):
-                to_remove.append(r)
-                if particles:
-                    particles.append(Particle(
-                        r.centerx, r.centery,
-                        random.uniform(-1, 1), random.uniform(-1.5, -0.3),
-                        (0, 255, 110), 0.3, size=2, trail=True
-                    ))
-        for r in to_remove:
-            if r in self.blocks:
-                self.blocks.remove(r)
+        if not self.rect.colliderect(rect):
+            return
+        cells, w = self.cells, self.grid_w
+        gx0, gy0, gx1, gy1 = self._cell_range(rect.left, rect.top, rect.right, rect.bottom)
+        for gy in range(gy0, gy1 + 1):
+            for gx in range(gx0, gx1 + 1):
+                if cells[gy * w + gx]:
+                    self._remove(gx, gy, particles, 1, (-1.5, -0.3), 0.3)
 
 class Game:
     def __init__(self):
@@ -12,6 +12,10 @@ import math
 import json
 import os
 import time
+import hashlib
+from collections import deque
+
+import numpy as np
 
 # --- CONFIGURATION ---
 WIDTH, HEIGHT = 800, 600
@@ -23,10 +27,12 @@ MAX_ENEMY_BULLETS = 6
 NUM_ENEMIES_ROWS = 4
 NUM_ENEMIES_COLS = 8
 SAVE_FILE = "neon_invaders_save.json"
+SPRITE_CACHE_DIR = "neon_invaders_sprites"  # The packed sprite atlas is cached here as PNG + JSON; None disables the cache
 
 # Colors
 BG_COLOR = (10, 12, 25)
 PLAYER_COLOR = (0, 255, 200)
+NEON_SKIN_COLOR = (255, 0, 255)  # Cyberpunk Purple
 ENEMY_1_COLOR = (255, 69, 0)  # Orange
 ENEMY_2_COLOR = (0, 255, 127)  # Green
 ENEMY_3_COLOR = (138, 43, 226)  # Purple
@@ -80,16 +86,7 @@ UPGRADES = [
 ]
 
 
-# --- SPRITE GENERATOR (Procedural Pixel Art) ---
-def create_pixel_art(width, height, color, pattern):
-    surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    for y, row in enumerate(pattern):
-        for x, val in enumerate(row):
-            if val:
-                pygame.draw.rect(surface, color, (x * 2, y * 2, 2, 2))
-    return surface
-
-
+# --- SPRITES (Procedural Pixel Art) ---
 # Define Sprites as Binary Maps
 PLAYER_MAP = [
     [0, 0, 0, 1, 1, 1, 0, 0],
@@ -144,71 +141,243 @@ UFO_MAP = [
     [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0]
 ]
 
-# Pre-generate Sprites
-SPRITE_PLAYER = create_pixel_art(16, 16, PLAYER_COLOR, PLAYER_MAP)
-SPRITE_ENEMY_1 = create_pixel_art(20, 16, ENEMY_1_COLOR, ENEMY_1_MAP)
-SPRITE_ENEMY_2 = create_pixel_art(20, 16, ENEMY_2_COLOR, ENEMY_2_MAP)
-SPRITE_ENEMY_3 = create_pixel_art(20, 16, ENEMY_3_COLOR, ENEMY_3_MAP)
-SPRITE_UFO = create_pixel_art(22, 14, UFO_COLOR, UFO_MAP)
+# Each map pixel is 2x2 on a canvas of the given size; `sizes` are the extra nearest-neighbour scalings drawn in game.
+# The first color is the default. A sprite can list several animation frames.
+SPRITE_SPECS = {
+    'player': {'frames': [PLAYER_MAP], 'colors': [PLAYER_COLOR, NEON_SKIN_COLOR], 'canvas': (16, 16),
+               'sizes': [(32, 32)]},
+    'enemy_1': {'frames': [ENEMY_1_MAP], 'colors': [ENEMY_1_COLOR], 'canvas': (20, 16), 'sizes': [(35, 25)]},
+    'enemy_2': {'frames': [ENEMY_2_MAP], 'colors': [ENEMY_2_COLOR], 'canvas': (20, 16), 'sizes': [(35, 25)]},
+    'enemy_3': {'frames': [ENEMY_3_MAP], 'colors': [ENEMY_3_COLOR], 'canvas': (20, 16), 'sizes': [(35, 25)]},
+    'ufo': {'frames': [UFO_MAP], 'colors': [UFO_COLOR], 'canvas': (22, 14), 'sizes': [(50, 30)]},
+}
+ATLAS_WIDTH = 256
+
+
+class SpriteAtlas:
+    """Every color, size and animation frame of every sprite, packed into one texture.
+    Variants are looked up by (name, color, size, frame) and drawn with a sub-rect blit."""
+    specs = SPRITE_SPECS
+    texture = None
+    rects = {}  # (name, color, size, frame) -> pygame.Rect in texture
+
+    @staticmethod
+    def render(pattern, color, canvas, size):
+        """RGBA pixels, shaped (width, height, 4) for surfarray, of one map drawn at 2x on canvas and
+        scaled to size with the same nearest-neighbour rule as pygame.transform.scale."""
+        cells = np.array(pattern, dtype=bool).T  # Indexed [x, y] like surfarray
+        xs = np.arange(size[0]) * canvas[0] // size[0] // 2
+        ys = np.arange(size[1]) * canvas[1] // size[1] // 2
+        inside_x, inside_y = xs < cells.shape[0], ys < cells.shape[1]
+        mask = cells[np.minimum(xs, cells.shape[0] - 1)][:, np.minimum(ys, cells.shape[1] - 1)]
+        mask &= inside_x[:, None] & inside_y[None, :]
+        pixels = np.zeros((size[0], size[1], 4), np.uint8)
+        pixels[mask] = (*color, 255)
+        return pixels
+
+    @classmethod
+    def build(cls, specs):
+        """Render every variant and shelf-pack them, tallest first, with a 1 px gutter.
+        Returns (RGBA array of the whole atlas, {key: (x, y, width, height)})."""
+        variants = []
+        for name, spec in specs.items():
+            for size in [spec['canvas']] + spec['sizes']:
+                for color in spec['colors']:
+                    for frame, pattern in enumerate(spec['frames']):
+                        key = (name, tuple(color), tuple(size), frame)
+                        variants.append((key, cls.render(pattern, color, spec['canvas'], size)))
+        variants.sort(key=lambda variant: -variant[1].shape[1])
+
+        rects, x, y, shelf_height = {}, 0, 0, 0
+        for key, pixels in variants:
+            width, height = pixels.shape[:2]
+            if x + width > ATLAS_WIDTH:
+                x, y, shelf_height = 0, y + shelf_height + 1, 0
+            rects[key] = (x, y, width, height)
+            x += width + 1
+            shelf_height = max(shelf_height, height)
+        atlas = np.zeros((ATLAS_WIDTH, y + shelf_height, 4), np.uint8)
+        for key, pixels in variants:
+            left, top, width, height = rects[key]
+            atlas[left:left + width, top:top + height] = pixels
+        return atlas, rects
+
+    @staticmethod
+    def to_surface(atlas):
+        surface = pygame.Surface(atlas.shape[:2], pygame.SRCALPHA)
+        pygame.surfarray.pixels3d(surface)[...] = atlas[..., :3]
+        pygame.surfarray.pixels_alpha(surface)[...] = atlas[..., 3]
+        return surface
+
+    @classmethod
+    def load(cls, specs=SPRITE_SPECS, cache_dir=SPRITE_CACHE_DIR):
+        """Build the atlas, or reuse the cached one when the sprite maps, colors and sizes are unchanged."""
+        cls.specs = specs
+        key = hashlib.sha1(repr((sorted(specs.items()), ATLAS_WIDTH)).encode()).hexdigest()[:12]
+        path = os.path.join(cache_dir, f"atlas_{key}") if cache_dir else None
+        if path and os.path.exists(path + ".png") and os.path.exists(path + ".json"):
+            try:
+                texture = pygame.image.load(path + ".png")
+                with open(path + ".json", 'r') as f:
+                    entries = json.load(f)
+                cls.texture = texture
+                cls.rects = {(name, tuple(color), tuple(size), frame): pygame.Rect(rect)
+                             for name, color, size, frame, rect in entries}
+                return
+            except (pygame.error, OSError, ValueError):
+                pass  # Unreadable cache entry: build it again below
+        atlas, rects = cls.build(specs)
+        cls.texture = cls.to_surface(atlas)
+        cls.rects = {variant: pygame.Rect(rect) for variant, rect in rects.items()}
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                pygame.image.save(cls.texture, path + ".png")
+                with open(path + ".json", 'w') as f:
+                    json.dump([[*variant, rect] for variant, rect in rects.items()], f)
+            except (pygame.error, OSError) as e:
+                print(f"Could not cache sprite atlas: {e}")
+
+    @classmethod
+    def rect(cls, name, size=None, color=None, frame=0):
+        spec = cls.specs[name]
+        return cls.rects[name, tuple(color or spec['colors'][0]), tuple(size or spec['canvas']), frame]
+
+    @classmethod
+    def blit(cls, surface, pos, name, size=None, color=None, frame=0):
+        surface.blit(cls.texture, pos, cls.rect(name, size, color, frame))
 
 
 # --- AUDIO SYSTEM ---
+# Mixer voices per sound category. A category never takes channels from another one.
+VOICE_LIMITS = {'shoot': 3, 'enemy_shoot': 3, 'explosion': 4, 'combo': 2}
+EXPLOSION_VARIANTS = 4
+# Notes are (start seconds, frequency, duration, volume, wave type); layered effects are notes starting together
+EFFECTS = {
+    'shoot': [(0.0, 880, 0.1, 0.15, 'square'), (0.0, 1100, 0.05, 0.1, 'square')],
+    'enemy_shoot': [(0.0, 200, 0.2, 0.1, 'sawtooth')],
+    'combo': [(0.0, 1200, 0.05, 0.1, 'square'), (0.0, 1500, 0.05, 0.1, 'square')],
+}
+JINGLES = {
+    'powerup': [(0.0, 600, 0.05, 0.2, 'square'), (0.08, 900, 0.05, 0.2, 'square'), (0.16, 900, 0.05, 0.2, 'square')],
+    'level_up': [(0.0, 400, 0.1, 0.2, 'sawtooth'), (0.1, 600, 0.1, 0.2, 'square')],
+}
+
+
+class VoicePool:
+    """A fixed set of mixer channels for one sound category. When every voice is busy the oldest one is stolen."""
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.started = [0] * len(channels)
+
+    def play(self, sound, tick):
+        index = 0
+        for i in range(len(self.channels)):
+            if not self.channels[i].get_busy():
+                index = i
+                break
+            if self.started[i] < self.started[index]:
+                index = i
+        self.started[index] = tick
+        self.channels[index].play(sound)
+
+
+class Sequencer:
+    """Plays jingles on a channel of its own. Each jingle is pre-rendered with its notes at exact sample offsets;
+    jingles requested while one is playing wait in a small queue and are chained with Channel.queue, so each
+    starts on the sample the previous one ends, with no timer events involved."""
+
+    def __init__(self, channel, max_pending=4):
+        self.channel = channel
+        self.pending = deque(maxlen=max_pending)
+
+    def play(self, sound):
+        self.pending.append(sound)
+        self.update()
+
+    def update(self):
+        """Feed the channel from the queue; call once per frame."""
+        if self.pending and not self.channel.get_busy():
+            self.channel.play(self.pending.popleft())
+        if self.pending and self.channel.get_queue() is None:
+            self.channel.queue(self.pending.popleft())
+
+
 class SoundManager:
     def __init__(self):
         pygame.mixer.init(44100, -16, 2, 512)
-        self.channels = [pygame.mixer.Channel(i) for i in range(8)]
-        self.sample_rate = 44100
-
-    def create_tone(self, freq, duration, vol=0.3, wave_type='square'):
-        samples = int(self.sample_rate * duration)
-        buffer = [0] * (samples * 2)
-        max_sample = 32767
-        for s in range(samples):
-            t = float(s) / self.sample_rate
-            if wave_type == 'square':
-                value = 1 if (t * freq) % 1 < 0.5 else -1
-                sample_val = int(max_sample * vol * value)
-            elif wave_type == 'sawtooth':
-                value = 2 * ((t * freq) % 1) - 1
-                sample_val = int(max_sample * vol * value)
-            else:
-                value = math.sin(2 * math.pi * freq * t)
-                sample_val = int(max_sample * vol * value)
+        self.sample_rate, _, self.channel_count = pygame.mixer.get_init()
+        # Reserve the pooled voices plus one sequencer channel so nothing else can claim them
+        reserved = sum(VOICE_LIMITS.values()) + 1
+        pygame.mixer.set_num_channels(max(reserved, pygame.mixer.get_num_channels()))
+        pygame.mixer.set_reserved(reserved)
+        self.voices, first = {}, 0
+        for category, limit in VOICE_LIMITS.items():
+            self.voices[category] = VoicePool([pygame.mixer.Channel(i) for i in range(first, first + limit)])
+            first += limit
+        self.sequencer = Sequencer(pygame.mixer.Channel(first))
+        self.tick = 0
+
+        # Everything is rendered up front, so playing a sound never synthesizes or allocates a buffer
+        self.effects = {name: self.render(notes) for name, notes in EFFECTS.items()}
+        self.jingles = {name: self.render(notes) for name, notes in JINGLES.items()}
+        rng = np.random.default_rng(0)
+        self.explosions = [self.make_sound(rng.uniform(-0.5, 0.5, int(self.sample_rate * 0.25)))
+                           for _ in range(EXPLOSION_VARIANTS)]
+
+    def wave(self, freq, duration, vol=0.3, wave_type='square'):
+        """One note as float samples."""
+        phase = np.arange(int(self.sample_rate * duration)) / self.sample_rate * freq
+        if wave_type == 'square':
+            value = np.where(phase % 1 < 0.5, 1.0, -1.0)
+        elif wave_type == 'sawtooth':
+            value = 2 * (phase % 1) - 1
+        else:
+            value = np.sin(2 * np.pi * phase)
+        return vol * value
+
+    def render(self, notes):
+        """Mix notes into one Sound, each starting at its exact sample offset."""
+        starts = [int(round(start * self.sample_rate)) for start, *_ in notes]
+        waves = [self.wave(freq, duration, vol, wave_type) for _, freq, duration, vol, wave_type in notes]
+        mix = np.zeros(max(start + len(w) for start, w in zip(starts, waves)))
+        for start, w in zip(starts, waves):
+            mix[start:start + len(w)] += w
+        return self.make_sound(mix)
+
+    def make_sound(self, samples):
+        """Float samples to a Sound; sndarray wants a 1-D array for a mono mixer and (n, channels) otherwise."""
+        pcm = (np.clip(samples, -1, 1) * 32767).astype(np.int16)
+        if self.channel_count == 1:
+            return pygame.sndarray.make_sound(pcm)
+        return pygame.sndarray.make_sound(np.repeat(pcm[:, None], self.channel_count, axis=1))
+
+    def play(self, category, sound):
+        self.tick += 1
+        self.voices[category].play(sound, self.tick)
 
-            buffer[s * 2] = sample_val
-            buffer[s * 2 + 1] = sample_val
-        return pygame.sndarray.make_sound(
-            pygame.sndarray.array(buffer).astype('int16').reshape((-1, 2))
-        )
+    def update(self):
+        self.sequencer.update()
 
     def play_shoot(self):
-        self.channels[0].play(self.create_tone(880, 0.1, 0.15, 'square'))
-        self.channels[1].play(self.create_tone(1100, 0.05, 0.1, 'square'))
+        self.play('shoot', self.effects['shoot'])
 
     def play_enemy_shoot(self):
-        self.channels[2].play(self.create_tone(200, 0.2, 0.1, 'sawtooth'))
+        self.play('enemy_shoot', self.effects['enemy_shoot'])
 
     def play_explosion(self):
-        duration = 0.25
-        samples = int(self.sample_rate * duration)
-        buffer = [random.randint(-16384, 16384) for _ in range(samples * 2)]
-        self.channels[3].play(pygame.sndarray.make_sound(
-            pygame.sndarray.array(buffer).astype('int16').reshape((-1, 2))
-        ))
+        self.play('explosion', random.choice(self.explosions))
 
     def play_powerup(self):
         # Play a pleasant arpeggio for powerup
-        self.channels[4].play(self.create_tone(600, 0.05, 0.2, 'square'))
-        pygame.time.set_timer(pygame.USEREVENT + 1, 80, 1)
-        pygame.time.set_timer(pygame.USEREVENT + 2, 160, 1)
+        self.sequencer.play(self.jingles['powerup'])
 
     def play_combo(self):
-        self.channels[5].play(self.create_tone(1200, 0.05, 0.1, 'square'))
-        self.channels[6].play(self.create_tone(1500, 0.05, 0.1, 'square'))
+        self.play('combo', self.effects['combo'])
 
     def play_level_up(self):
-        self.channels[7].play(self.create_tone(400, 0.1, 0.2, 'sawtooth'))
-        pygame.time.set_timer(pygame.USEREVENT + 3, 100, 1)
+        self.sequencer.play(self.jingles['level_up'])
 
 
 # --- CLASSES ---
@@ -413,7 +582,7 @@ class Player:
         if self.upgrades.get("rapid_start"):
             self.shoot_delay = 200
         if self.upgrades.get("neon_skin"):
-            self.color = (255, 0, 255)  # Cyberpunk Purple
+            self.color = NEON_SKIN_COLOR
         if self.upgrades.get("starter_shield"):
             self.shield_active = True
             self.shield_timer = pygame.time.get_ticks()
@@ -471,16 +640,14 @@ class Player:
                                (int(self.x + self.width // 2), int(self.y + self.height // 2)),
                                self.width // 2 + 5, 2)
 
-        # Draw Sprite (Scaled) with Glow
-        scaled_sprite = pygame.transform.scale(SPRITE_PLAYER, (self.width, self.height))
-
+        # Glow, then the ship sprite in the ship's color
         # Glow Effect
         glow_surf = pygame.Surface((self.width + 10, self.height + 10), pygame.SRCALPHA)
         glow_color = (*self.color[:3], 100)
         pygame.draw.rect(glow_surf, glow_color, (0, 0, self.width + 10, self.height + 10))
         surface.blit(glow_surf, (self.x - 5, self.y - 5))
 
-        surface.blit(scaled_sprite, (int(self.x), int(self.y)))
+        SpriteAtlas.blit(surface, (int(self.x), int(self.y)), 'player', (self.width, self.height), self.color)
 
         # Engine Glow
         glow_size = 5 + int(math.sin(pygame.time.get_ticks() * 0.02) * 2)
@@ -496,15 +663,15 @@ class Invader:
         self.level = level
 
         if row == 0:
-            self.sprite = SPRITE_ENEMY_3
+            self.sprite = 'enemy_3'
             self.color = ENEMY_3_COLOR
             self.score_value = 30
         elif row < 3:
-            self.sprite = SPRITE_ENEMY_2
+            self.sprite = 'enemy_2'
             self.color = ENEMY_2_COLOR
             self.score_value = 20
         else:
-            self.sprite = SPRITE_ENEMY_1
+            self.sprite = 'enemy_1'
             self.color = ENEMY_1_COLOR
             self.score_value = 10
 
@@ -518,8 +685,8 @@ class Invader:
 
     def draw(self, surface, time):
         sine_offset = math.sin(time * 0.05 + self.animation_offset) * 3
-        scaled_sprite = pygame.transform.scale(self.sprite, (self.width + 5, self.height + 5))
-        surface.blit(scaled_sprite, (int(self.x + sine_offset), int(self.y)))
+        SpriteAtlas.blit(surface, (int(self.x + sine_offset), int(self.y)), self.sprite,
+                         (self.width + 5, self.height + 5))
         self.rect = pygame.Rect(self.x + sine_offset, self.y, self.width + 5, self.height + 5)
 
 
@@ -553,8 +720,7 @@ class UFO:
         self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
 
     def draw(self, surface):
-        scaled_sprite = pygame.transform.scale(SPRITE_UFO, (self.width, self.height))
-        surface.blit(scaled_sprite, (int(self.x), int(self.y)))
+        SpriteAtlas.blit(surface, (int(self.x), int(self.y)), 'ufo', (self.width, self.height))
 
 
 class PersistenceManager:
@@ -616,6 +782,7 @@ class Game:
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Neon Space Invaders")
+        SpriteAtlas.load()
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 20, bold=True)
         self.large_font = pygame.font.SysFont("Arial", 48, bold=True)
@@ -1073,11 +1240,8 @@ class Game:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
-                if event.type in [pygame.USEREVENT + 1, pygame.USEREVENT + 2]:
-                    self.sound_manager.create_tone(900, 0.05, 0.2, 'square').play()
-                if event.type == pygame.USEREVENT + 3:
-                    self.sound_manager.create_tone(600, 0.1, 0.2, 'square').play()
 
+            self.sound_manager.update()
             self.handle_input()
             self.update_logic()
             self.draw()